@@ -5,12 +5,15 @@ Example: Send a daily HTML report via email.
 Set these environment variables (or create a .env file):
     EMAIL_ADDRESS=you@gmail.com
     EMAIL_PASSWORD=your_app_password
+
+The SMTP session is opened once, so adding more emails to the report
+does not pay for another TLS handshake and login each time.
 """
 
 import sys, os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
 
-from email_sender import send_html_email
+from email_sender import SMTPSession, send_html_email
 
 
 def daily_report():
@@ -28,12 +31,14 @@ def daily_report():
     <p>All tasks completed successfully.</p>
     """
 
-    send_html_email(
-        to="recipient@example.com",
-        subject="Daily Automation Report",
-        html_body=html,
-        plain_fallback="Daily report: all tasks OK.",
-    )
+    with SMTPSession() as smtp:
+        send_html_email(
+            to="recipient@example.com",
+            subject="Daily Automation Report",
+            html_body=html,
+            plain_fallback="Daily report: all tasks OK.",
+            smtp=smtp,
+        )
 
 
 if __name__ == "__main__":
@@ -24,14 +24,12 @@ def create_sales_report():
         ["Service Y", 12000, 13500, 14200, 15800, 55500],
     ]
 
-    mgr.create_sheet("Annual Sales", data=data, headers=headers)
-
-    # Format currency columns (2-6)
-    for col in range(2, 7):
-        mgr.format_column_as_currency(col)
-
-    # Highlight totals above 100k
-    mgr.highlight_cells(col=6, threshold=100000, color="92D050")
+    # Currency columns (2-6) and totals above 100k are styled as rows are written
+    mgr.create_sheet(
+        "Annual Sales", data=data, headers=headers,
+        column_formats={col: "$#,##0.00" for col in range(2, 7)},
+        highlights=[(6, 100000, "92D050")],
+    )
 
     mgr.auto_fit_columns()
     mgr.add_bar_chart("Quarterly Revenue", data_col=2, position="H2")
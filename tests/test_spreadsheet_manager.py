@@ -0,0 +1,47 @@
+"""Round-trip checks for SpreadsheetManager.export_bulk."""
+
+import os
+import sys
+from datetime import date, datetime, time
+from decimal import Decimal
+from fractions import Fraction
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+from openpyxl import load_workbook
+
+from spreadsheet_manager import SpreadsheetManager
+
+
+def _export(tmp_path, headers, rows):
+    path = str(tmp_path / "bulk.xlsx")
+    SpreadsheetManager(str(tmp_path / "unused.xlsx")).export_bulk(path, headers, rows)
+    return load_workbook(path).active
+
+
+def test_export_bulk_round_trips_typed_values(tmp_path):
+    row = [
+        "plain", 42, 1.5, Decimal("12.34"), Fraction(1, 4), True,
+        date(2026, 10, 15), datetime(2026, 10, 15, 13, 27), None, time(6, 30),
+    ]
+    ws = _export(tmp_path, ["H"] * len(row), [row])
+
+    assert ws["A1"].font.b
+    values = [cell.value for cell in ws[2]]
+    assert values[:6] == ["plain", 42, 1.5, 12.34, 0.25, True]
+    assert values[6] == datetime(2026, 10, 15)
+    assert ws["G2"].is_date
+    assert values[7] == datetime(2026, 10, 15, 13, 27)
+    assert values[8] is None
+    assert values[9] == time(6, 30)
+
+
+def test_export_bulk_blanks_non_finite_and_strips_control_chars(tmp_path):
+    rows = [
+        [float("nan"), float("inf"), float("-inf"), "a\x00b\x0bc\x1fd", "<&>\"'\tok"],
+    ]
+    ws = _export(tmp_path, None, rows)
+
+    assert [ws.cell(1, c).value for c in (1, 2, 3)] == [None, None, None]
+    assert ws["D1"].value == "abcd"
+    assert ws["E1"].value == "<&>\"'\tok"
@@ -0,0 +1,46 @@
+"""Checks for WeatherDashboard.classify_bulk."""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "tools"))
+
+pytest.importorskip("requests")
+
+import weather_dashboard
+from weather_dashboard import WeatherDashboard
+
+UNKNOWN = WeatherDashboard.UNKNOWN_BUCKET
+
+
+def _expected(codes):
+    return [weather_dashboard._CODE_BUCKETS.get(code, UNKNOWN) for code in codes]
+
+
+def test_buckets_cover_exactly_the_described_codes():
+    assert weather_dashboard._CODE_BUCKETS.keys() == WeatherDashboard.WEATHER_CODES.keys()
+    assert set(weather_dashboard._CODE_BUCKETS.values()) == set(
+        range(len(WeatherDashboard.CONDITION_BUCKETS))
+    )
+
+
+def test_classify_bulk_sequences():
+    dash = WeatherDashboard()
+    codes = [0, 3, 45, 61, 75, 99, 4, 100, 255]
+    assert list(dash.classify_bulk(codes)) == _expected(codes)
+    assert list(dash.classify_bulk(iter(codes))) == _expected(codes)
+    # Out-of-range codes take the per-item fallback
+    assert list(dash.classify_bulk((-1, 0, 256, 95))) == [UNKNOWN, 0, UNKNOWN, 4]
+
+
+def test_classify_bulk_numpy_matches_sequence_path():
+    np = pytest.importorskip("numpy")
+    dash = WeatherDashboard()
+    codes = np.array([[0, 2, 63], [-5, 96, 300]], dtype=np.int64)
+    out = dash.classify_bulk(codes)
+
+    assert out.dtype == np.uint8
+    assert out.shape == codes.shape
+    assert out.ravel().tolist() == _expected(codes.ravel().tolist())
@@ -6,7 +6,8 @@ Watches a folder (default: ~/Downloads) and automatically sorts new
 files into category subfolders the moment they appear.
 
 Waits 3 seconds after the last write to ensure downloads are complete
-before moving the file.
+before moving the file; a timer fires exactly when the oldest pending
+file settles, so nothing runs while the folder is idle.
 
 Usage:
     python auto_organizer.py                   # Watch ~/Downloads
@@ -17,9 +18,13 @@ Press Ctrl+C to stop.
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import os
 import time
 import sys
+import heapq
 import shutil
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 from watchdog.observers import Observer
@@ -38,6 +43,13 @@ FILE_CATEGORIES = {
     "Programs": [".exe", ".msi", ".dmg", ".pkg"],
 }
 
+# Reverse index: extension -> category
+_EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in FILE_CATEGORIES.items()
+    for ext in extensions
+}
+
 
 class DownloadOrganizer(FileSystemEventHandler):
     """Move new files to category subfolders after they finish downloading."""
@@ -45,10 +57,19 @@ class DownloadOrganizer(FileSystemEventHandler):
     # Extensions that indicate an incomplete download
     TEMP_EXTENSIONS = {".tmp", ".part", ".crdownload", ".partial"}
 
-    def __init__(self, downloads_folder):
+    # Colliding names whose next _N suffix is remembered (least recent dropped)
+    COUNTER_CACHE_SIZE = 256
+
+    def __init__(self, downloads_folder, settle_seconds: float = 3.0):
         super().__init__()
         self.downloads_folder = Path(downloads_folder)
+        self.settle_seconds = settle_seconds
         self.pending = {}  # path -> last_modified_time
+        self._heap = []    # (last_modified_time, path); superseded entries skipped lazily
+        self._lock = threading.Lock()
+        self._timer = None  # fires process_pending when the oldest entry settles
+        self._same_device = {}  # category dir -> on the watched folder's filesystem?
+        self._next_counter = OrderedDict()  # (category dir, name) -> next _N suffix
 
     # ------------------------------------------------------------------
     # Helpers
@@ -56,11 +77,7 @@ class DownloadOrganizer(FileSystemEventHandler):
 
     @staticmethod
     def get_category(extension: str) -> str:
-        ext = extension.lower()
-        for category, extensions in FILE_CATEGORIES.items():
-            if ext in extensions:
-                return category
-        return "Other"
+        return _EXT_TO_CATEGORY.get(extension.lower(), "Other")
 
     def organize_file(self, file_path: str):
         path = Path(file_path)
@@ -73,17 +90,61 @@ class DownloadOrganizer(FileSystemEventHandler):
         dest_dir = self.downloads_folder / category
         dest_dir.mkdir(exist_ok=True)
 
-        destination = dest_dir / path.name
-        counter = 1
-        while destination.exists():
-            destination = dest_dir / f"{path.stem}_{counter}{path.suffix}"
-            counter += 1
+        try:
+            destination = self._reserve_destination(dest_dir, path)
+        except OSError as exc:
+            print(f"Error: {path.name}: {exc}")
+            return
 
         try:
-            shutil.move(str(path), str(destination))
+            # Both overwrite the empty placeholder we just reserved
+            if self._is_same_device(dest_dir):
+                os.replace(path, destination)
+            else:
+                shutil.move(str(path), str(destination))
             print(f"Organized: {path.name} -> {category}/")
         except Exception as exc:
             print(f"Error: {path.name}: {exc}")
+            try:
+                destination.unlink()
+            except OSError:
+                pass
+
+    def _reserve_destination(self, dest_dir: Path, path: Path) -> Path:
+        """
+        Claim a free name in *dest_dir* by creating it with O_EXCL.
+
+        Tries the plain name, then name_N from where the last collision for
+        this name left off, so repeated downloads of the same file don't
+        re-probe every earlier suffix. Only the COUNTER_CACHE_SIZE most
+        recently colliding names are remembered.
+        """
+        key = (dest_dir, path.name)
+        candidate = dest_dir / path.name
+        counter = self._next_counter.get(key, 1)
+        while True:
+            try:
+                os.close(os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+            except FileExistsError:
+                candidate = dest_dir / f"{path.stem}_{counter}{path.suffix}"
+                counter += 1
+                continue
+            if candidate.name == path.name:
+                # The plain name was free again; nothing worth remembering
+                self._next_counter.pop(key, None)
+            else:
+                self._next_counter[key] = counter
+                self._next_counter.move_to_end(key)
+                if len(self._next_counter) > self.COUNTER_CACHE_SIZE:
+                    self._next_counter.popitem(last=False)
+            return candidate
+
+    def _is_same_device(self, dest_dir: Path) -> bool:
+        same = self._same_device.get(dest_dir)
+        if same is None:
+            same = os.stat(dest_dir).st_dev == os.stat(self.downloads_folder).st_dev
+            self._same_device[dest_dir] = same
+        return same
 
     # ------------------------------------------------------------------
     # Watchdog callbacks
@@ -93,24 +154,61 @@ class DownloadOrganizer(FileSystemEventHandler):
         if event.is_directory:
             return
         print(f"New file detected: {Path(event.src_path).name}")
-        self.pending[event.src_path] = time.time()
+        self._touch(event.src_path)
 
     def on_modified(self, event):
         if event.is_directory:
             return
         if event.src_path in self.pending:
-            self.pending[event.src_path] = time.time()
+            self._touch(event.src_path)
+
+    def _touch(self, path: str):
+        now = time.time()
+        with self._lock:
+            self.pending[path] = now
+            heapq.heappush(self._heap, (now, path))
+            # Later writes never settle sooner, so an armed timer stays valid
+            if self._timer is None:
+                self._arm()
+
+    def _arm(self):
+        """Schedule process_pending for when the heap's oldest entry settles. Lock held."""
+        if not self._heap:
+            return
+        delay = max(0.0, self._heap[0][0] + self.settle_seconds - time.time())
+        self._timer = threading.Timer(delay, self.process_pending)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        """Cancel the pending settle timer."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
 
     # ------------------------------------------------------------------
-    # Periodic check
+    # Settle handling
     # ------------------------------------------------------------------
 
-    def process_pending(self, settle_seconds: float = 3.0):
+    def process_pending(self, settle_seconds: float = None):
         """Move files that haven't been modified for *settle_seconds*."""
-        now = time.time()
-        ready = [p for p, t in self.pending.items() if now - t > settle_seconds]
+        if settle_seconds is None:
+            settle_seconds = self.settle_seconds
+        cutoff = time.time() - settle_seconds
+        ready = []
+        with self._lock:
+            heap = self._heap
+            while heap and heap[0][0] <= cutoff:
+                modified, path = heapq.heappop(heap)
+                if self.pending.get(path) == modified:
+                    del self.pending[path]
+                    ready.append(path)
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._arm()
         for path in ready:
-            del self.pending[path]
             self.organize_file(path)
 
 
@@ -129,14 +227,17 @@ def auto_organize(folder: str = None):
     observer.schedule(handler, str(folder), recursive=False)
     observer.start()
 
+    # Files are moved from the handler's settle timer; this thread only
+    # waits. Windows can't interrupt an untimed join with Ctrl+C.
+    timeout = 1.0 if sys.platform == "win32" else None
     try:
-        while True:
-            time.sleep(1)
-            handler.process_pending()
+        while observer.is_alive():
+            observer.join(timeout)
     except KeyboardInterrupt:
         print("\nStopping...")
         observer.stop()
 
+    handler.stop()
     observer.join()
     print("Auto-organizer stopped.")
 
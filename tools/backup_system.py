@@ -3,31 +3,115 @@
 Backup System
 =============
 Create full and incremental backups of any folder.
-Tracks file changes via MD5 hashing so incremental backups only copy
+Tracks file changes via content hashing so incremental backups only copy
 what has actually changed since the last run.
 
+Hashing uses BLAKE3 when the optional ``blake3`` package is installed,
+falls back to xxHash (``xxhash``), and finally to the standard library's MD5.
+History is serialized with ``orjson`` when available.
+
 Features:
     - Full or incremental mode
     - Hash-based change detection
     - Backup history tracking
     - Backup verification
     - Exclude patterns
+    - Parallel hashing and copying
+    - Reflink (copy-on-write) copies on Btrfs, XFS and APFS
 
 Usage:
     python backup_system.py <source> <destination>
     python backup_system.py <source> <destination> --full
+    python backup_system.py <source> <destination> --jobs 8
+    python backup_system.py <source> <destination> --reflink=auto|always|never
     python backup_system.py <source> <destination> --list
     python backup_system.py <source> <destination> --verify <timestamp>
 
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import os
+import re
 import sys
+import errno
+import fnmatch
 import json
+import mmap
+import queue
 import hashlib
+import threading
 import shutil
+from itertools import repeat
 from pathlib import Path
 from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+try:
+    import blake3
+except ImportError:
+    blake3 = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Fastest available hash for change detection. Stored in history.json so
+# hashes written by a different algorithm are treated as "changed".
+if blake3 is not None:
+    HASH_ALGO = "blake3"
+elif xxhash is not None:
+    HASH_ALGO = "xxh3_64"
+else:
+    HASH_ALGO = "md5"
+
+# Hex digest length of each algorithm, to identify manifests that predate
+# the recorded "hash_algo"
+_DIGEST_ALGOS = {64: "blake3", 16: "xxh3_64", 32: "md5"}
+
+# Read size for the hashing and fused copy-and-hash loops
+COPY_CHUNK_SIZE = 1 << 20
+
+# Largest chunk handed to a single sendfile() call
+SENDFILE_CHUNK = 1 << 30
+
+# Kernel-copy errors meaning "not supported for these files", not I/O failure
+_COPY_UNSUPPORTED = {
+    errno.EINVAL, errno.ENOSYS, errno.ENOTSOCK, errno.EOPNOTSUPP,
+    errno.ENOTSUP, errno.ENOTTY, errno.EXDEV,
+}
+
+# Same semantics as GNU cp --reflink
+REFLINK_MODES = ("auto", "always", "never")
+
+# ioctl request number for Linux FICLONE (_IOW(0x94, 9, int))
+_FICLONE = 0x40049409
+
+# Files larger than this are hashed through mmap instead of read buffers
+MMAP_THRESHOLD = 16 * 1024 * 1024
+
+# Hashing and copying are I/O-bound and release the GIL, so oversubscribe
+DEFAULT_JOBS = min(32, (os.cpu_count() or 1) * 4)
+
+# The hash log is compacted once it holds this many more lines than entries
+HASH_LOG_SLACK = 1000
+
+# Directory walking is dominated by stat latency, not CPU
+WALK_WORKERS = (os.cpu_count() or 1) * 2
+
+# Above this many bytes, verification hashes in worker processes
+PROCESS_POOL_THRESHOLD = 1 << 30
 
 
 class BackupSystem:
@@ -41,6 +125,11 @@ class BackupSystem:
         self.metadata_folder.mkdir(exist_ok=True)
 
         self.history_file = self.metadata_folder / "history.json"
+        # Append-only NDJSON log of file_hashes records; the last line wins
+        self.hash_log_file = self.metadata_folder / "file_hashes.ndjson"
+        self._hash_log_lines = 0
+        self._rewrite_hash_log = False
+        self._pending_hashes = {}
         self.history = self._load_history()
 
     # ------------------------------------------------------------------
@@ -49,29 +138,336 @@ class BackupSystem:
 
     def _load_history(self) -> dict:
         if self.history_file.exists():
-            with open(self.history_file, "r") as fh:
-                return json.load(fh)
-        return {"backups": [], "file_hashes": {}}
+            history = _loads(self.history_file.read_bytes())
+        else:
+            history = {"backups": []}
+
+        # Older histories kept every hash inline; move them into the log
+        file_hashes = history.pop("file_hashes", None)
+        if file_hashes is None:
+            file_hashes = self._read_hash_log()
+        else:
+            self._rewrite_hash_log = True
+            # Pre-cache histories stored bare hash strings: keep the hash,
+            # but with no mtime/size the file is re-read on the next run
+            for key, entry in file_hashes.items():
+                if isinstance(entry, str):
+                    file_hashes[key] = {"hash": entry, "mtime_ns": None, "size": None}
+
+        # Histories written before the tag existed used MD5
+        if history.get("hash_algo", "md5") != HASH_ALGO:
+            file_hashes = {}
+            self._rewrite_hash_log = True
+        history["hash_algo"] = HASH_ALGO
+        history["file_hashes"] = file_hashes
+        return history
+
+    def _read_hash_log(self) -> dict:
+        file_hashes = {}
+        if not self.hash_log_file.exists():
+            return file_hashes
+        with open(self.hash_log_file, "rb") as fh:
+            for line in fh:
+                self._hash_log_lines += 1
+                try:
+                    record = _loads(line)
+                except ValueError:
+                    continue  # torn write from an interrupted run
+                file_hashes[record.pop("path")] = record
+        return file_hashes
+
+    def _record_hash(self, key: str, entry: dict):
+        self.history["file_hashes"][key] = entry
+        self._pending_hashes[key] = entry
 
     def _save_history(self):
-        with open(self.history_file, "w") as fh:
-            json.dump(self.history, fh, indent=2, default=str)
+        """
+        Write backup summaries to history.json and new hashes to the log.
+
+        Only records changed since the last save are appended; the log is
+        rewritten from scratch once it has grown well past the live entries.
+        The log is written first and history.json replaced atomically, so a
+        failure never leaves a history that has dropped its inline hashes
+        without the log that holds them.
+        """
+        file_hashes = self.history["file_hashes"]
+        lines = self._hash_log_lines + len(self._pending_hashes)
+        if self._rewrite_hash_log or lines > 2 * len(file_hashes) + HASH_LOG_SLACK:
+            _atomic_write(
+                self.hash_log_file,
+                lambda fh: fh.writelines(_hash_log_line(k, e) for k, e in file_hashes.items()),
+            )
+            self._hash_log_lines = len(file_hashes)
+            self._rewrite_hash_log = False
+        elif self._pending_hashes:
+            with open(self.hash_log_file, "ab") as fh:
+                fh.writelines(_hash_log_line(k, e) for k, e in self._pending_hashes.items())
+            self._hash_log_lines = lines
+        self._pending_hashes.clear()
+
+        summary = {k: v for k, v in self.history.items() if k != "file_hashes"}
+        data = _dumps(summary, pretty=True)
+        _atomic_write(self.history_file, lambda fh: fh.write(data))
+
+    @staticmethod
+    def _hash_available(algo: str) -> bool:
+        if algo == "blake3":
+            return blake3 is not None
+        if algo == "xxh3_64":
+            return xxhash is not None
+        return algo == "md5"
+
+    @staticmethod
+    def _new_hasher(algo: str = None):
+        algo = algo or HASH_ALGO
+        if algo == "blake3":
+            return blake3.blake3()
+        if algo == "xxh3_64":
+            return xxhash.xxh3_64()
+        return hashlib.md5()
 
     @staticmethod
-    def _calculate_hash(file_path) -> str:
-        md5 = hashlib.md5()
+    def _calculate_hash(file_path, algo: str = None) -> str:
+        """Hash *file_path* with *algo* (default: ``HASH_ALGO``)."""
+        algo = algo or HASH_ALGO
+        if algo == "blake3":
+            hasher = blake3.blake3()
+            hasher.update_mmap(file_path)
+            return hasher.hexdigest()
+
         with open(file_path, "rb") as fh:
-            for chunk in iter(lambda: fh.read(4096), b""):
-                md5.update(chunk)
-        return md5.hexdigest()
+            if os.fstat(fh.fileno()).st_size > MMAP_THRESHOLD:
+                hasher = BackupSystem._new_hasher(algo)
+                with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    if hasattr(mm, "madvise"):  # Python 3.8+, Unix only
+                        mm.madvise(mmap.MADV_SEQUENTIAL)
+                    hasher.update(mm)
+                return hasher.hexdigest()
+
+            if hasattr(hashlib, "file_digest"):  # Python 3.11+
+                return hashlib.file_digest(fh, lambda: BackupSystem._new_hasher(algo)).hexdigest()
+
+            hasher = BackupSystem._new_hasher(algo)
+            buf = bytearray(COPY_CHUNK_SIZE)
+            view = memoryview(buf)
+            while True:
+                n = fh.readinto(buf)
+                if not n:
+                    break
+                hasher.update(view[:n])
+        return hasher.hexdigest()
 
-    def _should_backup(self, file_path, incremental: bool) -> bool:
-        if not incremental:
-            return True
-        key = str(file_path)
-        if key not in self.history["file_hashes"]:
+    @staticmethod
+    def _hash_batch(paths, jobs: int = None, processes: bool = False, algo: str = None) -> dict:
+        """
+        Hash many independent files concurrently with *algo*.
+
+        Uses threads by default, or one worker process per CPU when
+        *processes* is True. Returns ``{path: hexdigest}``; files that
+        cannot be read map to None.
+        """
+        if processes:
+            executor = ProcessPoolExecutor(max_workers=jobs or os.cpu_count())
+            chunksize = 16
+        else:
+            executor = ThreadPoolExecutor(max_workers=jobs or DEFAULT_JOBS)
+            chunksize = 1
+        with executor:
+            digests = executor.map(_safe_hash, paths, repeat(algo), chunksize=chunksize)
+            return dict(zip(paths, digests))
+
+    def _manifest_file(self, timestamp: str) -> Path:
+        return self.metadata_folder / f"manifest_{timestamp}.json"
+
+    def _save_manifest(self, timestamp: str, manifest: dict):
+        """Record ``{relative_path: hash}`` and the hash algorithm for one backup."""
+        path = self._manifest_file(timestamp)
+        if path.exists():
+            # Two runs within the same second share a backup directory
+            algo, files = self._load_manifest(timestamp)
+            if algo == HASH_ALGO:
+                manifest = {**files, **manifest}
+        path.write_bytes(_dumps({"hash_algo": HASH_ALGO, "files": manifest}, pretty=True))
+
+    def _load_manifest(self, timestamp: str):
+        """Return ``(hash_algo, {relative_path: hash})``; ``(None, {})`` if absent."""
+        path = self._manifest_file(timestamp)
+        if not path.exists():
+            return None, {}
+        data = _loads(path.read_bytes())
+        if isinstance(data.get("files"), dict) and "hash_algo" in data:
+            return data["hash_algo"], data["files"]
+        # Older manifests were a bare mapping; tell the algorithm by length
+        algo = _DIGEST_ALGOS.get(len(next(iter(data.values()), "")), HASH_ALGO)
+        return algo, data
+
+    @staticmethod
+    def _fast_copy(src, dst, reflink: str = "auto") -> bool:
+        """
+        Copy *src* to *dst* without moving the data through Python.
+
+        Tries, in order: a reflink clone (unless *reflink* is "never"),
+        copy_file_range(2) (only for "auto", since it may reflink too),
+        sendfile(2) where it accepts regular files (Linux), and CopyFileExW
+        on Windows. Returns False when no kernel-side copy is available for
+        this pair, leaving the caller to copy by hand. With "always", a
+        failed clone raises OSError instead.
+        """
+        if reflink != "never" and BackupSystem._clone(src, dst):
             return True
-        return self._calculate_hash(file_path) != self.history["file_hashes"][key]
+        if reflink == "always":
+            raise OSError(errno.EOPNOTSUPP, "Reflink not supported", str(dst))
+        if os.name == "nt":
+            return BackupSystem._copy_file_ex(src, dst)
+
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            in_fd, out_fd = fin.fileno(), fout.fileno()
+            if reflink == "auto" and hasattr(os, "copy_file_range"):
+                if BackupSystem._copy_loop(
+                    lambda off: os.copy_file_range(in_fd, out_fd, SENDFILE_CHUNK, off, off)
+                ):
+                    return True
+            if hasattr(os, "sendfile"):
+                return BackupSystem._copy_loop(
+                    lambda off: os.sendfile(out_fd, in_fd, off, SENDFILE_CHUNK)
+                )
+        return False
+
+    @staticmethod
+    def _copy_loop(copy_chunk) -> bool:
+        """Call ``copy_chunk(offset)`` until it copies nothing more."""
+        offset = 0
+        while True:
+            try:
+                copied = copy_chunk(offset)
+            except OSError as exc:
+                if offset == 0 and exc.errno in _COPY_UNSUPPORTED:
+                    return False
+                raise
+            if copied == 0:
+                return True
+            offset += copied
+
+    @staticmethod
+    def _clone(src, dst) -> bool:
+        """
+        Reflink *dst* to the data blocks of *src* (Btrfs, XFS, APFS).
+
+        Returns False when the filesystem or platform cannot clone.
+        """
+        if sys.platform == "darwin":
+            import ctypes
+
+            libc = ctypes.CDLL("/usr/lib/libSystem.dylib", use_errno=True)
+            if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+                return True
+            err = ctypes.get_errno()
+            if err in _COPY_UNSUPPORTED:
+                return False
+            raise OSError(err, os.strerror(err), str(dst))
+
+        if fcntl is None or not sys.platform.startswith("linux"):
+            return False
+        with open(src, "rb") as fin, open(dst, "wb") as fout:
+            try:
+                fcntl.ioctl(fout.fileno(), _FICLONE, fin.fileno())
+            except OSError as exc:
+                if exc.errno in _COPY_UNSUPPORTED:
+                    return False
+                raise
+        return True
+
+    @staticmethod
+    def _copy_file_ex(src, dst) -> bool:
+        """Windows only: copy through kernel32's CopyFileExW."""
+        import ctypes
+        from ctypes import wintypes
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        copy_file_ex = kernel32.CopyFileExW
+        copy_file_ex.argtypes = [
+            wintypes.LPCWSTR, wintypes.LPCWSTR,
+            ctypes.c_void_p, ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD,
+        ]
+        copy_file_ex.restype = wintypes.BOOL
+        if not copy_file_ex(str(src), str(dst), None, None, None, 0):
+            raise ctypes.WinError(ctypes.get_last_error())
+        return True
+
+    @staticmethod
+    def _stream_copy_and_hash(src, dst) -> str:
+        """Copy *src* to *dst* and hash it in one read pass."""
+        hasher = BackupSystem._new_hasher()
+        buf = bytearray(COPY_CHUNK_SIZE)
+        view = memoryview(buf)
+        with open(src, "rb", buffering=0) as fin, open(dst, "wb") as fout:
+            while True:
+                n = fin.readinto(buf)
+                if not n:
+                    break
+                fout.write(view[:n])
+                hasher.update(view[:n])
+        return hasher.hexdigest()
+
+    @staticmethod
+    def _copy_and_hash(src, dst, reflink: str = "auto", known_hash: str = None) -> str:
+        """
+        Copy *src* to *dst* (with metadata) and return the content hash.
+
+        *known_hash* is a hash already recorded for this exact file (same
+        mtime and size); after a kernel-side copy it is used instead of
+        reading the data again.
+        """
+        if BackupSystem._fast_copy(src, dst, reflink):
+            # Hash the source, not the copy: after sendfile its pages are
+            # in the page cache, while a clone (or a copy_file_range that
+            # reflinked) read nothing, so this is the file's one full read
+            digest = known_hash or BackupSystem._calculate_hash(src)
+        else:
+            digest = BackupSystem._stream_copy_and_hash(src, dst)
+        shutil.copystat(src, dst)
+        return digest
+
+    def _backup_file(self, file_path, dest, old_entry, reflink="auto", incremental=True):
+        """
+        Copy *file_path* to *dest* unless it matches *old_entry*.
+
+        *old_entry* is the file's ``history["file_hashes"]`` record (or None).
+        In incremental mode, files whose mtime and size still match are
+        skipped without reading them; anything else is copied and hashed in
+        a single pass, and the copy is dropped again if the content turns
+        out to be unchanged. Full mode copies everything, but reuses the
+        recorded hash of unchanged files instead of re-reading them.
+        Runs in a worker thread, so it never touches ``self.history``.
+
+        Returns ``(entry, copied)`` where *entry* is the record to store,
+        or None when the stored record is still accurate.
+        """
+        st = file_path.stat()
+        old_hash = known_hash = None
+        if old_entry is not None:
+            unchanged = old_entry["mtime_ns"] == st.st_mtime_ns and old_entry["size"] == st.st_size
+            if incremental:
+                if unchanged:
+                    return None
+                old_hash = old_entry["hash"]
+            elif unchanged:
+                known_hash = old_entry["hash"]
+
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        partial = dest.with_name(dest.name + ".partial")
+        try:
+            digest = self._copy_and_hash(file_path, partial, reflink, known_hash)
+        except Exception:
+            partial.unlink(missing_ok=True)
+            raise
+
+        entry = {"hash": digest, "mtime_ns": st.st_mtime_ns, "size": st.st_size}
+        if entry["hash"] == old_hash:
+            partial.unlink()
+            return entry, False
+        os.replace(partial, dest)
+        return entry, True
 
     @staticmethod
     def _format_size(size_bytes: int) -> str:
@@ -90,17 +486,25 @@ class BackupSystem:
         source_folder: str,
         incremental: bool = True,
         exclude_patterns: list = None,
+        jobs: int = None,
+        reflink: str = "auto",
     ) -> dict:
         """
         Back up *source_folder* into a timestamped sub-directory.
 
+        Files are hashed and copied by *jobs* worker threads
+        (default: ``DEFAULT_JOBS``). *reflink* is one of ``REFLINK_MODES``
+        and controls copy-on-write clones like GNU ``cp --reflink``.
+
         Returns a stats dict with counts and sizes.
         """
         source = Path(source_folder)
         if not source.exists():
             raise FileNotFoundError(f"Source not found: {source}")
+        if reflink not in REFLINK_MODES:
+            raise ValueError(f"reflink must be one of {REFLINK_MODES}, got {reflink!r}")
 
-        exclude_patterns = exclude_patterns or []
+        is_excluded = _exclude_matcher(exclude_patterns or [])
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_dir = self.destination / f"backup_{timestamp}"
         backup_dir.mkdir(parents=True, exist_ok=True)
@@ -123,32 +527,52 @@ class BackupSystem:
             "errors": [],
         }
 
-        for file_path in source.rglob("*"):
-            if file_path.is_dir():
-                continue
-            stats["files_checked"] += 1
-
-            relative = file_path.relative_to(source)
-            if any(file_path.match(p) for p in exclude_patterns):
-                stats["files_skipped"] += 1
-                continue
+        file_hashes = self.history["file_hashes"]
+        manifest = {}
+
+        with ThreadPoolExecutor(max_workers=jobs or DEFAULT_JOBS) as executor:
+            futures = {}
+            # Walking overlaps with the workers already hashing/copying
+            for file_path in _walk_files(source):
+                stats["files_checked"] += 1
+
+                relative = file_path.relative_to(source)
+                if is_excluded(file_path):
+                    stats["files_skipped"] += 1
+                    continue
+
+                future = executor.submit(
+                    self._backup_file, file_path, backup_dir / relative,
+                    file_hashes.get(str(file_path)), reflink, incremental,
+                )
+                futures[future] = (file_path, relative)
+
+            # Results are merged here, on the main thread only
+            for future in as_completed(futures):
+                file_path, relative = futures[future]
+                try:
+                    result = future.result()
+                except Exception as exc:
+                    stats["errors"].append(f"{relative}: {exc}")
+                    print(f"  ERROR: {relative}: {exc}")
+                    continue
+
+                if result is None:
+                    stats["files_skipped"] += 1
+                    continue
+
+                entry, copied = result
+                self._record_hash(str(file_path), entry)
+                if not copied:
+                    stats["files_skipped"] += 1
+                    continue
 
-            if not self._should_backup(file_path, incremental):
-                stats["files_skipped"] += 1
-                continue
-
-            dest = backup_dir / relative
-            dest.parent.mkdir(parents=True, exist_ok=True)
-            try:
-                shutil.copy2(str(file_path), str(dest))
-                self.history["file_hashes"][str(file_path)] = self._calculate_hash(file_path)
                 stats["files_backed_up"] += 1
-                stats["total_size"] += file_path.stat().st_size
+                stats["total_size"] += entry["size"]
+                manifest[relative.as_posix()] = entry["hash"]
                 print(f"  Backed up: {relative}")
-            except Exception as exc:
-                stats["errors"].append(f"{relative}: {exc}")
-                print(f"  ERROR: {relative}: {exc}")
 
+        self._save_manifest(timestamp, manifest)
         self.history["backups"].append(stats)
         self._save_history()
 
@@ -171,27 +595,171 @@ class BackupSystem:
             print("  (none)")
 
     def verify_backup(self, backup_timestamp: str) -> dict:
-        """Check that every file in a backup is readable and intact."""
+        """
+        Check that every file in a backup is readable and intact.
+
+        Files are re-hashed with the algorithm the backup was made with and
+        compared with the recorded hashes, so silent corruption is caught as
+        well as read errors. Backups made before hashes were recorded, or
+        whose algorithm is no longer installed, are only checked for
+        readability.
+        """
         backup_dir = self.destination / f"backup_{backup_timestamp}"
         if not backup_dir.exists():
             raise FileNotFoundError(f"Backup not found: {backup_timestamp}")
 
+        algo, manifest = self._load_manifest(backup_timestamp)
+        check_hashes = True
+        if algo is not None and not self._hash_available(algo):
+            print(f"Warning: {algo} is not installed; checking readability only")
+            algo, check_hashes = None, False
+
         print(f"Verifying: {backup_timestamp}")
-        results = {"verified": 0, "corrupted": []}
-        for fp in backup_dir.rglob("*"):
-            if fp.is_dir():
-                continue
-            try:
-                self._calculate_hash(fp)
-                results["verified"] += 1
-            except Exception:
+        results = {"verified": 0, "corrupted": [], "missing": []}
+        files = list(_walk_files(backup_dir))
+        # A dangling link or a file removed since the walk counts as 0 bytes
+        # here and is then reported as corrupted when it fails to hash
+        total_size = sum(map(_size_or_zero, files))
+        hashes = self._hash_batch(files, processes=total_size > PROCESS_POOL_THRESHOLD, algo=algo)
+
+        for fp, digest in hashes.items():
+            expected = manifest.pop(fp.relative_to(backup_dir).as_posix(), None)
+            if not check_hashes:
+                expected = None
+            if digest is None or (expected is not None and digest != expected):
                 results["corrupted"].append(str(fp))
+            else:
+                results["verified"] += 1
+        results["missing"] = [str(backup_dir / rel) for rel in manifest]
 
         print(f"Verified:  {results['verified']} files")
         print(f"Corrupted: {len(results['corrupted'])} files")
+        if results["missing"]:
+            print(f"Missing:   {len(results['missing'])} files")
         return results
 
 
+# Mirrored in price_tracker.py (each tool runs standalone); keep in sync
+def _dumps(obj, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None, default=str).encode()
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _hash_log_line(key: str, entry: dict) -> bytes:
+    return _dumps({"path": key, **entry}) + b"\n"
+
+
+def _atomic_write(path: Path, write):
+    """Call ``write(fh)`` on a temp file, then swap it in for *path*."""
+    tmp = path.with_name(path.name + ".tmp")
+    try:
+        with open(tmp, "wb") as fh:
+            write(fh)
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def _exclude_matcher(patterns):
+    """
+    Build a ``Path -> bool`` predicate equivalent to
+    ``any(path.match(p) for p in patterns)``.
+
+    Plain name globs ("*.tmp", "~$*") are compiled once into a single regex
+    over the file name; patterns with a path separator keep ``Path.match``.
+    """
+    name_globs = [p for p in patterns if "/" not in p and "\\" not in p]
+    path_globs = [p for p in patterns if p not in name_globs]
+
+    name_re = None
+    if name_globs:
+        flags = re.IGNORECASE if os.name == "nt" else 0
+        name_re = re.compile("|".join(fnmatch.translate(p) for p in name_globs), flags)
+
+    def is_excluded(path) -> bool:
+        if name_re is not None and name_re.match(path.name):
+            return True
+        return any(path.match(p) for p in path_globs)
+
+    return is_excluded
+
+
+def _safe_hash(path, algo: str = None):
+    """Hash *path*, returning None if it cannot be read (picklable for pools)."""
+    try:
+        return BackupSystem._calculate_hash(path, algo)
+    except Exception:
+        return None
+
+
+def _size_or_zero(path) -> int:
+    try:
+        return path.stat().st_size
+    except OSError:
+        return 0
+
+
+def _walk_files(root, workers: int = None):
+    """
+    Yield every non-directory path under *root*, scanning directories in
+    parallel worker threads.
+
+    Like ``Path.rglob("*")``, symlinked directories are not descended into.
+    Paths come out in no particular order, as soon as they are found.
+    """
+    dirs = queue.Queue()
+    found = queue.Queue()
+    done = object()
+
+    def scan():
+        while True:
+            directory = dirs.get()
+            if directory is None:
+                return
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                dirs.put(entry.path)
+                            elif not entry.is_dir():
+                                found.put(Path(entry.path))
+                        except OSError:
+                            pass
+            except OSError:
+                pass
+            finally:
+                dirs.task_done()
+
+    workers = workers or WALK_WORKERS
+
+    def finish():
+        # A directory is only marked done after its subdirectories are queued
+        dirs.join()
+        found.put(done)
+        for _ in range(workers):
+            dirs.put(None)
+
+    dirs.put(str(root))
+    for _ in range(workers):
+        threading.Thread(target=scan, daemon=True).start()
+    threading.Thread(target=finish, daemon=True).start()
+
+    while True:
+        path = found.get()
+        if path is done:
+            return
+        yield path
+
+
 # ---------------------------------------------------------------------------
 # CLI
 # ---------------------------------------------------------------------------
@@ -217,8 +785,21 @@ def main():
             print("Provide a backup timestamp after --verify")
         return
 
+    jobs = None
+    if "--jobs" in sys.argv:
+        idx = sys.argv.index("--jobs")
+        if idx + 1 < len(sys.argv):
+            jobs = int(sys.argv[idx + 1])
+
+    reflink = "auto"
+    for arg in sys.argv[3:]:
+        if arg == "--reflink":
+            reflink = "always"
+        elif arg.startswith("--reflink="):
+            reflink = arg.split("=", 1)[1]
+
     incremental = "--full" not in sys.argv
-    backup.backup_folder(source, incremental=incremental)
+    backup.backup_folder(source, incremental=incremental, jobs=jobs, reflink=reflink)
 
 
 if __name__ == "__main__":
@@ -4,7 +4,11 @@ Email Sender
 ============
 Send plain-text, HTML, and attachment emails through any SMTP server.
 
-Supports Gmail, Outlook, Yahoo, and custom SMTP.
+Supports Gmail, Outlook, Yahoo, and custom SMTP. Port 465 uses implicit
+TLS (SMTP_SSL); any other port upgrades with STARTTLS.
+
+To send several emails over one login, open an SMTPSession and pass it
+as ``smtp=`` to the send functions.
 
 Usage:
     python email_sender.py             # Interactive mode
@@ -19,13 +23,15 @@ Environment variables or .env file:
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import io
 import os
+import re
 import sys
+import base64
 import smtplib
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from email.mime.base import MIMEBase
-from email import encoders
 from pathlib import Path
 
 
@@ -39,6 +45,19 @@ SMTP_PRESETS = {
     "yahoo":   {"server": "smtp.mail.yahoo.com",  "port": 587},
 }
 
+# One KEY=value assignment per line, matched against the whole line.
+# Values may be "double" or 'single' quoted (and then contain '=' or '#');
+# in unquoted values only whitespace followed by '#' starts a comment, so
+# pa#ss stays intact, as with python-dotenv.
+_ENV_RE = re.compile(
+    r"""[ \t]*([A-Za-z_][A-Za-z0-9_]*)[ \t]*=[ \t]*"""
+    r"""(?:(?:"([^"]*)"|'([^']*)')[ \t]*(?:#.*)?|(?!["'])(.*?)(?:[ \t]+#.*)?[ \t]*)"""
+)
+
+# Attachments are base64-encoded in chunks of this many bytes. A multiple of
+# 57 so every chunk encodes to whole 76-character lines (RFC 2045).
+ATTACHMENT_CHUNK_SIZE = 57 * 1024
+
 
 # ---------------------------------------------------------------------------
 # Core functions
@@ -52,19 +71,21 @@ def send_plain_email(
     password: str = None,
     smtp_server: str = None,
     smtp_port: int = None,
+    smtp: "SMTPSession" = None,
 ):
-    """Send a simple plain-text email."""
-    sender = sender or os.environ.get("EMAIL_ADDRESS", "")
-    password = password or os.environ.get("EMAIL_PASSWORD", "")
-    smtp_server = smtp_server or os.environ.get("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = smtp_port or int(os.environ.get("SMTP_PORT", "587"))
+    """Send a simple plain-text email, optionally over an open *smtp* session."""
+    if smtp is not None:
+        sender = sender or smtp.sender
+    sender, password, smtp_server, smtp_port = _resolve_settings(
+        sender, password, smtp_server, smtp_port
+    )
 
     msg = MIMEText(body, "plain")
     msg["Subject"] = subject
     msg["From"] = sender
     msg["To"] = to
 
-    _send(msg, sender, password, smtp_server, smtp_port)
+    _send(msg, sender, password, smtp_server, smtp_port, smtp)
     print(f"Sent plain email to {to}")
 
 
@@ -77,12 +98,14 @@ def send_html_email(
     password: str = None,
     smtp_server: str = None,
     smtp_port: int = None,
+    smtp: "SMTPSession" = None,
 ):
     """Send an HTML email with a plain-text fallback."""
-    sender = sender or os.environ.get("EMAIL_ADDRESS", "")
-    password = password or os.environ.get("EMAIL_PASSWORD", "")
-    smtp_server = smtp_server or os.environ.get("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = smtp_port or int(os.environ.get("SMTP_PORT", "587"))
+    if smtp is not None:
+        sender = sender or smtp.sender
+    sender, password, smtp_server, smtp_port = _resolve_settings(
+        sender, password, smtp_server, smtp_port
+    )
 
     msg = MIMEMultipart("alternative")
     msg["Subject"] = subject
@@ -93,7 +116,7 @@ def send_html_email(
         msg.attach(MIMEText(plain_fallback, "plain"))
     msg.attach(MIMEText(html_body, "html"))
 
-    _send(msg, sender, password, smtp_server, smtp_port)
+    _send(msg, sender, password, smtp_server, smtp_port, smtp)
     print(f"Sent HTML email to {to}")
 
 
@@ -106,12 +129,14 @@ def send_email_with_attachments(
     password: str = None,
     smtp_server: str = None,
     smtp_port: int = None,
+    smtp: "SMTPSession" = None,
 ):
     """Send an email with one or more file attachments."""
-    sender = sender or os.environ.get("EMAIL_ADDRESS", "")
-    password = password or os.environ.get("EMAIL_PASSWORD", "")
-    smtp_server = smtp_server or os.environ.get("SMTP_SERVER", "smtp.gmail.com")
-    smtp_port = smtp_port or int(os.environ.get("SMTP_PORT", "587"))
+    if smtp is not None:
+        sender = sender or smtp.sender
+    sender, password, smtp_server, smtp_port = _resolve_settings(
+        sender, password, smtp_server, smtp_port
+    )
 
     msg = MIMEMultipart()
     msg["Subject"] = subject
@@ -125,28 +150,121 @@ def send_email_with_attachments(
             print(f"  Warning: attachment not found: {path}")
             continue
 
-        with open(path, "rb") as fh:
-            part = MIMEBase("application", "octet-stream")
-            part.set_payload(fh.read())
-        encoders.encode_base64(part)
+        part = _attachment_part(path)
         part.add_header("Content-Disposition", f'attachment; filename="{path.name}"')
         msg.attach(part)
         print(f"  Attached: {path.name}")
 
-    _send(msg, sender, password, smtp_server, smtp_port)
+    _send(msg, sender, password, smtp_server, smtp_port, smtp)
     print(f"Sent email with {len(attachments)} attachment(s) to {to}")
 
 
+class SMTPSession:
+    """
+    One authenticated SMTP connection reused for many emails.
+
+    Saves the TLS handshake and login round-trips on every send after
+    the first.
+
+    Example
+    -------
+    >>> with SMTPSession() as smtp:
+    ...     send_plain_email("a@example.com", "Hi", "Hello!", smtp=smtp)
+    ...     send_html_email("b@example.com", "Report", "<h1>OK</h1>", smtp=smtp)
+    """
+
+    def __init__(
+        self,
+        sender: str = None,
+        password: str = None,
+        smtp_server: str = None,
+        smtp_port: int = None,
+    ):
+        self.sender, self.password, self.smtp_server, self.smtp_port = _resolve_settings(
+            sender, password, smtp_server, smtp_port
+        )
+        self.connection = None
+
+    def __enter__(self):
+        self.connection = _connect(self.sender, self.password, self.smtp_server, self.smtp_port)
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.connection.quit()
+        except smtplib.SMTPException:
+            self.connection.close()
+        self.connection = None
+
+    def send_message(self, msg):
+        if self.connection is None:
+            raise RuntimeError("SMTPSession is not open; use it in a 'with' block")
+        self.connection.send_message(msg)
+
+
 # ---------------------------------------------------------------------------
 # Internal
 # ---------------------------------------------------------------------------
 
-def _send(msg, sender, password, server, port):
-    with smtplib.SMTP(server, port) as smtp:
-        smtp.ehlo()
-        smtp.starttls()
-        smtp.ehlo()
+def _resolve_settings(sender, password, smtp_server, smtp_port):
+    """Fill in unset SMTP settings from the environment."""
+    sender = sender or os.environ.get("EMAIL_ADDRESS", "")
+    password = password or os.environ.get("EMAIL_PASSWORD", "")
+    smtp_server = smtp_server or os.environ.get("SMTP_SERVER", "smtp.gmail.com")
+    smtp_port = smtp_port or int(os.environ.get("SMTP_PORT", "587"))
+    return sender, password, smtp_server, smtp_port
+
+
+def _connect(sender, password, server, port) -> smtplib.SMTP:
+    """Open and log in to an SMTP connection (implicit TLS on port 465)."""
+    if port == 465:
+        smtp = smtplib.SMTP_SSL(server, port)
+    else:
+        smtp = smtplib.SMTP(server, port)
+    try:
+        if port != 465:
+            smtp.ehlo()
+            smtp.starttls()
+            smtp.ehlo()
         smtp.login(sender, password)
+    except BaseException:
+        smtp.close()
+        raise
+    return smtp
+
+
+def _attachment_part(path: Path) -> MIMEBase:
+    """Build a base64 attachment part, encoding the file chunk by chunk."""
+    encoded = io.StringIO()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(ATTACHMENT_CHUNK_SIZE), b""):
+            encoded.write(base64.encodebytes(chunk).decode("ascii"))
+
+    part = MIMEBase("application", "octet-stream")
+    part.set_payload(encoded.getvalue())
+    part["Content-Transfer-Encoding"] = "base64"
+    return part
+
+
+def _load_env(env_path: Path):
+    """Set variables from a .env file without overriding the environment."""
+    for lineno, line in enumerate(env_path.read_text().splitlines(), 1):
+        if not line.strip() or line.lstrip().startswith("#"):
+            continue
+        m = _ENV_RE.fullmatch(line)
+        if m is None:
+            print(f"  Warning: could not parse {env_path.name} line {lineno}")
+            continue
+        key, double, single, bare = m.groups()
+        value = next(v for v in (double, single, bare) if v is not None)
+        os.environ.setdefault(key, value)
+
+
+def _send(msg, sender, password, server, port, session=None):
+    if session is not None:
+        session.send_message(msg)
+        return
+    with _connect(sender, password, server, port) as smtp:
         smtp.send_message(msg)
 
 
@@ -162,11 +280,7 @@ def main():
     # Load .env if present
     env_path = Path(__file__).parent.parent / ".env"
     if env_path.exists():
-        for line in env_path.read_text().splitlines():
-            line = line.strip()
-            if line and not line.startswith("#") and "=" in line:
-                k, _, v = line.partition("=")
-                os.environ.setdefault(k.strip(), v.strip().strip("\"'"))
+        _load_env(env_path)
 
     print("Email Sender")
     print("=" * 50)
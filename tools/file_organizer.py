@@ -16,6 +16,8 @@ Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-ta
 """
 
 from pathlib import Path
+import errno
+import os
 import shutil
 import sys
 
@@ -50,22 +52,46 @@ FILE_CATEGORIES = {
 }
 
 
+# Reverse index: extension -> category
+_EXT_TO_CATEGORY = {
+    ext: category
+    for category, extensions in FILE_CATEGORIES.items()
+    for ext in extensions
+}
+
+
 def get_category(file_extension: str) -> str:
     """Return the category name for a given file extension, or 'Other'."""
-    ext = file_extension.lower()
-    for category, extensions in FILE_CATEGORIES.items():
-        if ext in extensions:
-            return category
-    return "Other"
+    return _EXT_TO_CATEGORY.get(file_extension.lower(), "Other")
+
+
+# Windows and macOS filesystems are case-insensitive by default
+_CASE_INSENSITIVE = sys.platform in ("win32", "darwin")
+
+
+def _name_key(name: str) -> str:
+    return name.casefold() if _CASE_INSENSITIVE else name
+
+
+def list_names(folder: Path) -> set:
+    """Return the names in *folder* as a set for ``get_unique_filename``."""
+    with os.scandir(folder) as it:
+        return {_name_key(e.name) for e in it}
 
 
-def get_unique_filename(path: Path) -> Path:
+def get_unique_filename(path: Path, existing: set = None) -> Path:
     """
     If *path* already exists, append _1, _2, ... until a free name is found.
 
+    *existing* is the set of names already in ``path.parent`` (see
+    ``list_names``). Pass it when resolving many names in the same folder
+    so the folder is listed once instead of stat-ing every candidate.
+
     Example: report.pdf -> report_1.pdf -> report_2.pdf
     """
-    if not path.exists():
+    if existing is None:
+        existing = list_names(path.parent) if path.parent.is_dir() else set()
+    if _name_key(path.name) not in existing:
         return path
 
     stem = path.stem
@@ -75,13 +101,32 @@ def get_unique_filename(path: Path) -> Path:
     counter = 1
     while True:
         new_path = parent / f"{stem}_{counter}{suffix}"
-        if not new_path.exists():
+        if _name_key(new_path.name) not in existing:
             return new_path
         counter += 1
         if counter > 1000:
             raise ValueError(f"Could not find unique name for {path}")
 
 
+def reserve_destination(path: Path, existing: set) -> Path:
+    """
+    Claim *path*, or its next free _N variant, by creating it with O_EXCL.
+
+    *existing* (see ``list_names``) only picks the candidates; a file that
+    appeared since the folder was listed makes the create fail, and the
+    next name is tried instead of overwriting it. The returned path is an
+    empty placeholder for the caller to replace.
+    """
+    while True:
+        candidate = get_unique_filename(path, existing)
+        existing.add(_name_key(candidate.name))
+        try:
+            os.close(os.open(candidate, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+        except FileExistsError:
+            continue
+        return candidate
+
+
 def organize_folder(folder_path: str = None, dry_run: bool = False) -> dict:
     """
     Move every file in *folder_path* into a subfolder named after its category.
@@ -113,11 +158,17 @@ def organize_folder(folder_path: str = None, dry_run: bool = False) -> dict:
 
     organized = {}
     errors = []
+    existing_names = {}  # category -> names already in its folder
 
-    for item in sorted(folder_path.iterdir()):
-        if item.is_dir() or item.name.startswith("."):
-            continue
+    with os.scandir(folder_path) as it:
+        # DirEntry.is_dir() answers from the directory listing, no stat()
+        entries = sorted(
+            (e for e in it if not e.name.startswith(".") and not e.is_dir()),
+            key=lambda e: e.name,
+        )
 
+    for entry in entries:
+        item = Path(entry.path)
         category = get_category(item.suffix)
         category_folder = folder_path / category
         destination = category_folder / item.name
@@ -127,10 +178,26 @@ def organize_folder(folder_path: str = None, dry_run: bool = False) -> dict:
 
         if not dry_run:
             try:
-                category_folder.mkdir(exist_ok=True)
-                if destination.exists():
-                    destination = get_unique_filename(destination)
-                shutil.move(str(item), str(destination))
+                existing = existing_names.get(category)
+                if existing is None:
+                    category_folder.mkdir(exist_ok=True)
+                    existing = existing_names[category] = list_names(category_folder)
+                destination = reserve_destination(destination, existing)
+                try:
+                    # Category folders live inside folder_path, so this is
+                    # normally a plain rename over our own empty placeholder
+                    try:
+                        os.replace(item, destination)
+                    except OSError as exc:
+                        if exc.errno != errno.EXDEV:
+                            raise
+                        shutil.move(str(item), str(destination))
+                except OSError:
+                    try:
+                        destination.unlink()
+                    except OSError:
+                        pass
+                    raise
             except Exception as e:
                 errors.append(f"{item.name}: {e}")
                 print(f"    ERROR: {e}")
@@ -5,29 +5,93 @@ Folder Monitor
 Watch any directory for real-time file-system events:
 created, modified, deleted, and moved/renamed.
 
+Bursts of "modified" events for the same file (editors often emit 5-20 per
+save) are coalesced into a single notification once the file has been
+quiet for 200 ms.
+
 Usage:
     python folder_monitor.py                  # Watch current directory
     python folder_monitor.py /path/to/watch   # Watch a specific folder
+    python folder_monitor.py /path --poll     # Poll instead of OS events
 
 Press Ctrl+C to stop.
 
+Linux note: each watched directory uses one inotify watch. For very large
+trees raise the limit, e.g.
+    sudo sysctl fs.inotify.max_user_watches=524288
+
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
 import time
 import sys
+import threading
 from pathlib import Path
 
 from watchdog.observers import Observer
+from watchdog.observers.polling import PollingObserver
 from watchdog.events import FileSystemEventHandler
 
+if sys.platform.startswith("linux"):
+    from watchdog.observers.inotify import InotifyObserver as NativeObserver
+else:
+    NativeObserver = Observer
+
 
 class FolderMonitor(FileSystemEventHandler):
-    """Print (and optionally callback) every file-system event."""
+    """
+    Print (and optionally callback) every file-system event.
 
-    def __init__(self, callback=None):
+    "modified" events are debounced: a file is reported once it has seen no
+    further modifications for *debounce* seconds. Pass ``debounce=0`` to
+    report every raw event immediately.
+    """
+
+    def __init__(self, callback=None, debounce: float = 0.2):
         super().__init__()
         self.callback = callback
+        self.debounce = debounce
+        self._pending = {}  # path -> time of last modified event, oldest first
+        self._lock = threading.Lock()
+        self._timer = None  # fires flush when the oldest pending path goes quiet
+        self._stopped = False
+
+    def _report_modified(self, path):
+        print(f"[MODIFIED] File: {path}")
+        if self.callback:
+            self.callback("modified", path)
+
+    def _arm(self):
+        """Schedule a flush for when the oldest pending path goes quiet. Lock held."""
+        if self._stopped or not self._pending:
+            return
+        oldest = next(iter(self._pending.values()))
+        delay = max(0.0, oldest + self.debounce - time.monotonic())
+        self._timer = threading.Timer(delay, self.flush, kwargs={"older_than": self.debounce})
+        self._timer.daemon = True
+        self._timer.start()
+
+    def stop(self):
+        """Cancel the debounce timer; call flush() afterwards to report leftovers."""
+        with self._lock:
+            self._stopped = True
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+
+    def flush(self, older_than: float = 0.0):
+        """Report pending modifications that have been quiet for *older_than* seconds."""
+        cutoff = time.monotonic() - older_than
+        with self._lock:
+            ready = [p for p, t in self._pending.items() if t <= cutoff]
+            for path in ready:
+                del self._pending[path]
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = None
+            self._arm()
+        for path in ready:
+            self._report_modified(path)
 
     def on_created(self, event):
         kind = "Directory" if event.is_directory else "File"
@@ -38,25 +102,44 @@ class FolderMonitor(FileSystemEventHandler):
     def on_modified(self, event):
         if event.is_directory:
             return
-        print(f"[MODIFIED] File: {event.src_path}")
-        if self.callback:
-            self.callback("modified", event.src_path)
+        if self.debounce <= 0:
+            self._report_modified(event.src_path)
+            return
+        with self._lock:
+            # Re-insert so the dict stays ordered by last modification
+            self._pending.pop(event.src_path, None)
+            self._pending[event.src_path] = time.monotonic()
+            # Later events never settle sooner, so an armed timer stays valid
+            if self._timer is None:
+                self._arm()
 
     def on_deleted(self, event):
+        with self._lock:
+            self._pending.pop(event.src_path, None)
         kind = "Directory" if event.is_directory else "File"
         print(f"[DELETED] {kind}: {event.src_path}")
         if self.callback and not event.is_directory:
             self.callback("deleted", event.src_path)
 
     def on_moved(self, event):
+        with self._lock:
+            modified = self._pending.pop(event.src_path, None) is not None
+        if modified:
+            self._report_modified(event.src_path)
         kind = "Directory" if event.is_directory else "File"
         print(f"[MOVED] {kind}: {event.src_path} -> {event.dest_path}")
         if self.callback and not event.is_directory:
             self.callback("moved", event.src_path, event.dest_path)
 
 
-def start_monitoring(folder_path, callback=None, recursive=True):
-    """Block until Ctrl+C, printing every event in *folder_path*."""
+def start_monitoring(folder_path, callback=None, recursive=True, polling=False, debounce=0.2):
+    """
+    Block until Ctrl+C, printing every event in *folder_path*.
+
+    Uses the platform's native event API (inotify, FSEvents,
+    ReadDirectoryChangesW) unless *polling* is True, which is only needed
+    for network shares and other filesystems that do not deliver events.
+    """
     folder_path = Path(folder_path)
     if not folder_path.is_dir():
         raise FileNotFoundError(f"Not a directory: {folder_path}")
@@ -66,8 +149,8 @@ def start_monitoring(folder_path, callback=None, recursive=True):
     print("Press Ctrl+C to stop")
     print("-" * 50)
 
-    handler = FolderMonitor(callback=callback)
-    observer = Observer()
+    handler = FolderMonitor(callback=callback, debounce=debounce)
+    observer = PollingObserver() if polling else NativeObserver()
     observer.schedule(handler, str(folder_path), recursive=recursive)
     observer.start()
 
@@ -79,6 +162,8 @@ def start_monitoring(folder_path, callback=None, recursive=True):
         observer.stop()
 
     observer.join()
+    handler.stop()
+    handler.flush()
     print("Monitor stopped.")
 
 
@@ -87,8 +172,9 @@ def main():
         print(__doc__)
         return
 
-    folder = sys.argv[1] if len(sys.argv) > 1 else str(Path.cwd())
-    start_monitoring(folder)
+    args = [a for a in sys.argv[1:] if not a.startswith("-")]
+    folder = args[0] if args else str(Path.cwd())
+    start_monitoring(folder, polling="--poll" in sys.argv)
 
 
 if __name__ == "__main__":
@@ -5,21 +5,41 @@ PDF Toolkit
 Merge, split, extract text, and search inside PDF files.
 
 Requires: PyPDF2
+Optional: pypdfium2 -- text extraction and search go through PDFium
+(C++), which is many times faster than PyPDF2's pure-Python extractor.
 
 Usage:
     python pdf_toolkit.py merge a.pdf b.pdf -o combined.pdf
     python pdf_toolkit.py split doc.pdf --pages 1-5
     python pdf_toolkit.py text doc.pdf
     python pdf_toolkit.py search doc.pdf "keyword"
+    python pdf_toolkit.py search doc.pdf "keyword" --first
 
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import io
+import os
+import re
 import sys
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
 
 from PyPDF2 import PdfReader, PdfWriter
 
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+
+# Below this many pages, starting worker processes costs more than it saves
+PARALLEL_MIN_PAGES = 32
+
 
 # ---------------------------------------------------------------------------
 # Core functions
@@ -30,7 +50,7 @@ def merge_pdfs(input_files: list, output_file: str = "merged.pdf"):
     writer = PdfWriter()
 
     for pdf_path in input_files:
-        reader = PdfReader(pdf_path)
+        reader = _get_reader(pdf_path)
         for page in reader.pages:
             writer.add_page(page)
         print(f"  Added: {pdf_path} ({len(reader.pages)} pages)")
@@ -53,7 +73,7 @@ def split_pdf(input_file: str, pages: str = None, output_dir: str = None):
     output_dir : str
         Directory for output files.
     """
-    reader = PdfReader(input_file)
+    reader = _get_reader(input_file)
     total = len(reader.pages)
     stem = Path(input_file).stem
 
@@ -65,60 +85,113 @@ def split_pdf(input_file: str, pages: str = None, output_dir: str = None):
     else:
         indices = list(range(total))
 
-    for idx in indices:
-        writer = PdfWriter()
-        writer.add_page(reader.pages[idx])
-        out_path = output_dir / f"{stem}_page_{idx + 1}.pdf"
-        with open(out_path, "wb") as fh:
-            writer.write(fh)
-        print(f"  Created: {out_path}")
+    jobs = [(idx, str(output_dir / f"{stem}_page_{idx + 1}.pdf")) for idx in indices]
+    if len(jobs) >= PARALLEL_MIN_PAGES:
+        with ProcessPoolExecutor() as ex:
+            for written in ex.map(_write_single_pages, repeat(input_file), _batches(jobs)):
+                for out_path in written:
+                    print(f"  Created: {out_path}")
+    else:
+        for idx, out_path in jobs:
+            _write_single_page(reader, idx, out_path)
+            print(f"  Created: {out_path}")
 
     print(f"Split {len(indices)} pages from {input_file}")
 
 
-def extract_text(input_file: str, output_file: str = None) -> str:
-    """Extract all text from a PDF. Optionally save to a file."""
-    reader = PdfReader(input_file)
-    all_text = []
-
-    for i, page in enumerate(reader.pages):
-        text = page.extract_text() or ""
-        all_text.append(f"--- Page {i + 1} ---\n{text}")
-
-    result = "\n\n".join(all_text)
+def extract_text(input_file: str, output_file: str = None, sink=None) -> str:
+    """
+    Extract all text from a PDF. Optionally save to a file.
 
+    Pages are written out in order as they are extracted; long PDFs are
+    extracted in parallel with only about one batch per CPU held in memory
+    at a time. With *output_file* (or a writable *sink*) the
+    text is streamed there and None is returned; otherwise it is printed
+    and also returned as a string.
+    """
     if output_file:
-        Path(output_file).write_text(result, encoding="utf-8")
+        with open(output_file, "w", encoding="utf-8") as fh:
+            _write_pages(input_file, fh)
         print(f"Text saved to: {output_file}")
-    else:
-        print(result)
-
-    return result
-
-
-def search_pdf(input_file: str, keyword: str):
-    """Search for a keyword in every page of a PDF."""
-    reader = PdfReader(input_file)
-    keyword_lower = keyword.lower()
-    found = 0
-
-    for i, page in enumerate(reader.pages):
-        text = (page.extract_text() or "").lower()
-        if keyword_lower in text:
-            found += 1
-            # Show context around the match
-            idx = text.find(keyword_lower)
-            start = max(0, idx - 60)
-            end = min(len(text), idx + len(keyword) + 60)
-            snippet = text[start:end].replace("\n", " ")
-            print(f"  Page {i + 1}: ...{snippet}...")
+        return None
+    if sink is not None:
+        _write_pages(input_file, sink)
+        return None
+
+    buf = io.StringIO()
+    for chunk in _page_chunks(input_file):
+        sys.stdout.write(chunk)
+        buf.write(chunk)
+    sys.stdout.write("\n")
+    return buf.getvalue()
+
+
+def _page_chunks(input_file):
+    """Yield the text output piece by piece: a header and body per page."""
+    for i, text in enumerate(_page_texts(input_file)):
+        yield f"--- Page {i + 1} ---\n" if i == 0 else f"\n\n--- Page {i + 1} ---\n"
+        yield text
+
+
+def _page_texts(input_file):
+    """Yield each page's text in order, extracting on all cores for long PDFs."""
+    with _open_text(input_file) as (total, page_text):
+        if total < PARALLEL_MIN_PAGES:
+            for i in range(total):
+                yield page_text(i)
+            return
+    # Workers open their own handles; ours is already closed. Keep about
+    # one batch per CPU in flight so finished text doesn't pile up ahead
+    # of a slow consumer.
+    window = os.cpu_count() or 1
+    pending = deque()
+    with ProcessPoolExecutor() as ex:
+        for batch in _batches(range(total)):
+            if len(pending) >= window:
+                yield from pending.popleft().result()
+            pending.append(ex.submit(_extract_pages, input_file, batch))
+        while pending:
+            yield from pending.popleft().result()
+
+
+def _write_pages(input_file, fh):
+    for chunk in _page_chunks(input_file):
+        fh.write(chunk)
+
+
+def search_pdf(input_file: str, keyword: str, first_only: bool = False) -> list:
+    """
+    Search for a keyword in every page of a PDF.
 
-    print(f"\nFound '{keyword}' on {found} page(s) out of {len(reader.pages)}")
+    Returns the 1-based numbers of the matching pages. With *first_only*
+    the scan stops at the first match.
+    """
+    # Case-insensitive scan of the raw text; no lowered copy of each page
+    pattern = re.compile(re.escape(keyword), re.IGNORECASE)
+    found = []
+
+    with _open_text(input_file) as (total, page_text):
+        for i in range(total):
+            text = page_text(i)
+            match = pattern.search(text)
+            if match:
+                found.append(i + 1)
+                # Show context around the match
+                start = max(0, match.start() - 60)
+                end = min(len(text), match.end() + 60)
+                snippet = text[start:end].replace("\n", " ")
+                print(f"  Page {i + 1}: ...{snippet}...")
+                if first_only:
+                    print(f"\nFirst match for '{keyword}' on page {i + 1}")
+                    return found
+
+    print(f"\nFound '{keyword}' on {len(found)} page(s) out of {total}")
+    return found
 
 
 def get_info(input_file: str):
     """Print metadata and page count for a PDF."""
-    reader = PdfReader(input_file)
+    reader = _get_reader(input_file)
     meta = reader.metadata
 
     print(f"File:    {input_file}")
@@ -133,6 +206,77 @@ def get_info(input_file: str):
 # Helpers
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
+def _cached_reader(path: str, mtime_ns: int, size: int) -> PdfReader:
+    return PdfReader(path)
+
+
+def _get_reader(path) -> PdfReader:
+    """Return a PdfReader for *path*, reused until the file changes."""
+    path = os.path.abspath(path)
+    st = os.stat(path)
+    return _cached_reader(path, st.st_mtime_ns, st.st_size)
+
+
+@contextmanager
+def _open_text(input_file: str):
+    """
+    Open *input_file* for text extraction.
+
+    Use as ``with _open_text(path) as (page_count, page_text):`` where
+    ``page_text(i)`` gives the text of zero-based page *i*. Uses PDFium
+    when installed, else PyPDF2; the PDFium document is closed on exit.
+    """
+    if pdfium is not None:
+        pdf = pdfium.PdfDocument(input_file)
+
+        def page_text(i: int) -> str:
+            page = pdf[i]
+            textpage = page.get_textpage()
+            try:
+                return textpage.get_text_range().replace("\r\n", "\n")
+            finally:
+                textpage.close()
+                page.close()
+
+        try:
+            yield len(pdf), page_text
+        finally:
+            pdf.close()
+        return
+
+    reader = _get_reader(input_file)
+    yield len(reader.pages), lambda i: reader.pages[i].extract_text() or ""
+
+
+def _batches(items, per_worker: int = 4) -> list:
+    """Cut *items* into contiguous batches, a few per CPU, keeping order."""
+    items = list(items)
+    size = max(1, -(-len(items) // ((os.cpu_count() or 1) * per_worker)))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _write_single_page(reader, idx: int, out_path: str):
+    writer = PdfWriter()
+    writer.add_page(reader.pages[idx])
+    with open(out_path, "wb") as fh:
+        writer.write(fh)
+
+
+# Worker-process entry points: each opens the PDF once for its whole batch
+
+def _write_single_pages(input_file: str, jobs: list) -> list:
+    reader = _get_reader(input_file)
+    for idx, out_path in jobs:
+        _write_single_page(reader, idx, out_path)
+    return [out_path for _, out_path in jobs]
+
+
+def _extract_pages(input_file: str, indices: list) -> list:
+    with _open_text(input_file) as (_, page_text):
+        return [page_text(i) for i in indices]
+
+
 def _parse_page_range(spec: str, total: int) -> list:
     """Parse '1-5', '3', or '1,3,5' into zero-based indices."""
     indices = []
@@ -195,9 +339,9 @@ def main():
 
     elif cmd == "search":
         if len(sys.argv) < 4:
-            print('Usage: pdf_toolkit.py search <file> "keyword"')
+            print('Usage: pdf_toolkit.py search <file> "keyword" [--first]')
             return
-        search_pdf(sys.argv[2], sys.argv[3])
+        search_pdf(sys.argv[2], sys.argv[3], first_only="--first" in sys.argv)
 
     elif cmd == "info":
         if len(sys.argv) < 3:
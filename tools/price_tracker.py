@@ -2,8 +2,9 @@
 """
 Price Tracker
 =============
-Monitor product prices on any website. Stores history in JSON,
-detects price drops, and can export to CSV.
+Monitor product prices on any website. Stores products in JSON and
+each product's price history in an append-only JSONL file, detects
+price drops, and can export to CSV.
 
 Features:
     - Add/remove products to track
@@ -12,6 +13,13 @@ Features:
     - Target-price notifications
     - CSV history export
 
+Pages are parsed with selectolax's Lexbor parser when it is installed
+(much faster), otherwise with BeautifulSoup + lxml. Fetched pages are
+cached in <data>_cache.sqlite for 5 minutes; after that the cached copy is
+still served for up to an hour while it is revalidated in the background
+(prices read from such a stale copy are shown but not added to history).
+Data is serialized with ``orjson`` when available.
+
 Usage:
     python price_tracker.py          # Interactive mode
     python price_tracker.py --help   # Show help
@@ -19,15 +27,125 @@ Usage:
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import os
 import re
+import csv
 import sys
 import json
+import hashlib
 import time
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import deque
 from pathlib import Path
+from urllib.parse import quote, urlsplit
 from datetime import datetime
 
 import requests
-from bs4 import BeautifulSoup
+import soupsieve
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Compiled once at import instead of on every parse
+_PAGE_PRICE_RES = tuple(re.compile(p) for p in (
+    r"\$\s*[\d,]+\.?\d*",
+    r"[\d,]+\.?\d*\s*(?:USD|EUR|GBP)",
+    r"\u20ac\s*[\d,]+\.?\d*",
+    r"\u00a3\s*[\d,]+\.?\d*",
+))
+
+
+class _PriceStrainer(SoupStrainer):
+    """
+    Only build tags that PRICE_SELECTORS could match (and their children).
+
+    Admits any tag whose class or id mentions "price", that carries a
+    data-price attribute, or has itemprop="price".  bs4 >= 4.13 asks
+    ``allow_tag_creation``; older releases call ``search_tag``.
+    """
+
+    @staticmethod
+    def _wanted(attrs):
+        if not attrs:
+            return False
+        if "data-price" in attrs or attrs.get("itemprop") == "price":
+            return True
+        for key in ("class", "id"):
+            value = attrs.get(key)
+            if isinstance(value, (list, tuple)):
+                value = " ".join(value)
+            if value and "price" in value:
+                return True
+        return False
+
+    def allow_tag_creation(self, nsprefix, name, attrs):
+        return self._wanted(attrs)
+
+    def search_tag(self, markup_name=None, markup_attrs={}):
+        if isinstance(markup_name, str) and self._wanted(markup_attrs):
+            return markup_name
+        return None
+
+
+_PRICE_STRAINER = _PriceStrainer()
+
+
+# Mirrors _dumps/_loads in backup_system.py (each tool runs standalone); keep in sync
+def _dumps(obj, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_INDENT_2 if pretty else 0)
+    return json.dumps(obj, indent=2 if pretty else None, default=str).encode()
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _PageCache:
+    """Tiny sqlite-backed HTTP cache: url -> (etag, last_modified, body, expires_at)."""
+
+    def __init__(self, path):
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False, isolation_level=None)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body BLOB, expires_at REAL)"
+        )
+
+    def get(self, url):
+        with self._lock:
+            return self._db.execute(
+                "SELECT etag, last_modified, body, expires_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+
+    def put(self, url, etag, last_modified, body, expires_at):
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?)",
+                (url, etag, last_modified, body, expires_at),
+            )
+
+    def touch(self, url, expires_at):
+        with self._lock:
+            self._db.execute("UPDATE pages SET expires_at = ? WHERE url = ?", (expires_at, url))
+
+    def prune(self, expired_before):
+        """Drop pages that expired before *expired_before* (too stale to serve)."""
+        with self._lock:
+            self._db.execute("DELETE FROM pages WHERE expires_at < ?", (expired_before,))
 
 
 class PriceTracker:
@@ -50,25 +168,129 @@ class PriceTracker:
         ".sale-price", ".final-price",
     ]
 
-    CURRENCY_SYMBOLS = {"$": "USD", "EUR": "EUR", "GBP": "GBP", "JPY": "JPY"}
+    # BeautifulSoup path: one grouped selector, compiled once; the
+    # individual selectors only rank the (few) hits back into priority order
+    _PRICE_SEL = soupsieve.compile(", ".join(PRICE_SELECTORS))
+    _PRICE_SEL_EACH = tuple(map(soupsieve.compile, PRICE_SELECTORS))
+
+    CURRENCY_SYMBOLS = {
+        "$": "USD", "\u20ac": "EUR", "\u00a3": "GBP", "\u00a5": "JPY",
+        "USD": "USD", "EUR": "EUR", "GBP": "GBP", "JPY": "JPY",
+    }
+
+    # One pass finds both currency markers (leading or trailing) and numbers
+    _PRICE_TOKEN_RE = re.compile(
+        "(?P<cur>" + "|".join(map(re.escape, CURRENCY_SYMBOLS)) + r")|(?P<num>[\d,]+\.?\d*)"
+    )
+
+    MAX_WORKERS = 8     # concurrent fetches in check_all
+    HOST_DELAY = 2.0    # minimum seconds between requests to the same host
+    CACHE_TTL = 300     # seconds a fetched page is served without asking again
+    CACHE_STALE = 3600  # past the TTL, serve stale and revalidate in background
 
     def __init__(self, data_file: str = "price_data.json"):
         self.data_file = Path(data_file)
+        self.history_dir = self.data_file.with_name(self.data_file.stem + "_history")
         self.data = self._load()
+        self._saved_digest = None   # digest of the last payload written
+        self._host_lock = threading.Lock()
+        self._host_next = {}    # netloc -> earliest time of the next request
+        self._revalidating = set()
+        self._cache = _PageCache(self.data_file.with_name(self.data_file.stem + "_cache.sqlite"))
+        self._cache.prune(time.time() - self.CACHE_STALE)
 
     # ------------------------------------------------------------------
     # Persistence
     # ------------------------------------------------------------------
 
     def _load(self) -> dict:
-        if self.data_file.exists():
-            with open(self.data_file, "r") as fh:
-                return json.load(fh)
-        return {"products": {}}
+        if not self.data_file.exists():
+            return {"products": {}}
+        data = _loads(self.data_file.read_bytes())
+        # Move histories embedded by older versions out to JSONL files
+        migrated = False
+        for pid, prod in data["products"].items():
+            history = prod.pop("price_history", None)
+            if history is None:
+                continue
+            migrated = True
+            path = self._history_file(pid)
+            if history and not path.exists():
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(b"".join(_dumps(r) + b"\n" for r in history))
+        if migrated:
+            tmp = self.data_file.with_name(self.data_file.name + ".tmp")
+            tmp.write_bytes(_dumps(data, pretty=True))
+            os.replace(tmp, self.data_file)
+        return data
 
     def _save(self):
-        with open(self.data_file, "w") as fh:
-            json.dump(self.data, fh, indent=2, default=str)
+        payload = _dumps(self.data, pretty=True)
+        # Skip the write when nothing changed since the last save
+        digest = hashlib.blake2b(payload, digest_size=8).digest()
+        if digest == self._saved_digest:
+            return
+        tmp = self.data_file.with_name(self.data_file.name + ".tmp")
+        tmp.write_bytes(payload)
+        os.replace(tmp, self.data_file)
+        self._saved_digest = digest
+
+    def _history_file(self, product_id: str) -> Path:
+        # Product ids come from user-typed names: percent-encode anything
+        # that isn't a plain filename character ("/", "\\", ":", ...)
+        return self.history_dir / f"{quote(product_id, safe='')}.jsonl"
+
+    def _append_history(self, product_id: str, record: dict):
+        path = self._history_file(product_id)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        line = _dumps(record) + b"\n"
+        with open(path, "a+b") as fh:
+            end = fh.seek(0, os.SEEK_END)
+            if end:
+                fh.seek(end - 1)
+                if fh.read(1) != b"\n":
+                    line = b"\n" + line  # don't glue onto a torn last line
+            fh.write(line)
+
+    def _iter_history(self, product_id: str):
+        """Yield *product_id*'s price records, oldest first."""
+        try:
+            fh = open(self._history_file(product_id), "rb")
+        except FileNotFoundError:
+            return
+        with fh:
+            for line in fh:
+                if line.strip():
+                    try:
+                        yield _loads(line)
+                    except ValueError:
+                        continue  # torn write from an interrupted append
+
+    def _last_record(self, product_id: str):
+        """Return the newest readable price record by reading the file backwards."""
+        try:
+            fh = open(self._history_file(product_id), "rb")
+        except FileNotFoundError:
+            return None
+        with fh:
+            pos = fh.seek(0, os.SEEK_END)
+            buf = b""
+            while pos > 0 or buf:
+                nl = buf.rfind(b"\n")
+                if nl == -1 and pos > 0:
+                    step = min(4096, pos)
+                    pos -= step
+                    fh.seek(pos)
+                    buf = fh.read(step) + buf
+                    continue
+                # Everything after the last newline in buf is a whole line
+                line, buf = buf[nl + 1:], buf[:max(nl, 0)]
+                if line.strip():
+                    try:
+                        return _loads(line)
+                    except ValueError:
+                        continue  # torn write: fall back to the line before
+            return None
 
     # ------------------------------------------------------------------
     # Price parsing helpers
@@ -77,59 +299,130 @@ class PriceTracker:
     @classmethod
     def _parse_price(cls, text: str):
         """Return (price_float, currency_str) from a string like '$99.99'."""
-        currency = "USD"
-        for sym, code in cls.CURRENCY_SYMBOLS.items():
-            if sym in text:
-                currency = code
+        currency = price = None
+        for m in cls._PRICE_TOKEN_RE.finditer(text):
+            cur = m.group("cur")
+            if cur is not None:
+                if currency is None:
+                    currency = cls.CURRENCY_SYMBOLS[cur]
+            elif price is None:
+                try:
+                    val = float(m.group("num").replace(",", ""))
+                except ValueError:
+                    continue
+                if val > 0:
+                    price = val
+            if price is not None and currency is not None:
                 break
-        matches = re.findall(r"[\d,]+\.?\d*", text)
-        for m in matches:
+        if price is None:
+            return None, None
+        return price, currency or "USD"
+
+    def _throttle(self, url: str):
+        """Block until *url*'s host may be hit again (HOST_DELAY apart)."""
+        host = urlsplit(url).netloc
+        with self._host_lock:
+            now = time.monotonic()
+            slot = max(now, self._host_next.get(host, now))
+            self._host_next[host] = slot + self.HOST_DELAY
+        if slot > now:
+            time.sleep(slot - now)
+
+    def _fetch(self, url: str):
+        """
+        Return ``(body, stale)`` for *url*. Raises RequestException.
+
+        *stale* is True when an expired cached copy is served while it is
+        revalidated in the background.
+        """
+        cached = self._cache.get(url)
+        if cached is not None:
+            overdue = time.time() - cached[3]
+            if overdue < 0:
+                return cached[2], False
+            if overdue < self.CACHE_STALE:
+                self._revalidate_later(url, cached)
+                return cached[2], True
+        return self._download(url, cached), False
+
+    def _download(self, url: str, cached=None):
+        """GET *url* (conditionally if *cached*), rate-limited per host."""
+        headers = self.DEFAULT_HEADERS
+        if cached is not None:
+            headers = dict(headers)
+            if cached[0]:
+                headers["If-None-Match"] = cached[0]
+            if cached[1]:
+                headers["If-Modified-Since"] = cached[1]
+        self._throttle(url)
+        resp = requests.get(url, headers=headers, timeout=10)
+        resp.raise_for_status()
+        expires_at = time.time() + self.CACHE_TTL
+        if resp.status_code == 304 and cached is not None:
+            self._cache.touch(url, expires_at)
+            return cached[2]
+        self._cache.put(
+            url, resp.headers.get("ETag"), resp.headers.get("Last-Modified"),
+            resp.content, expires_at,
+        )
+        return resp.content
+
+    def _revalidate_later(self, url: str, cached):
+        """Refresh a stale cache entry on a background thread."""
+        with self._host_lock:
+            if url in self._revalidating:
+                return
+            self._revalidating.add(url)
+
+        def run():
             try:
-                val = float(m.replace(",", ""))
-                if val > 0:
-                    return val, currency
-            except ValueError:
-                continue
-        return None, None
+                self._download(url, cached)
+            except requests.RequestException:
+                pass
+            finally:
+                with self._host_lock:
+                    self._revalidating.discard(url)
+
+        threading.Thread(target=run, daemon=True).start()
 
     def _extract_price(self, url: str):
-        """Fetch *url* and try multiple strategies to find the price."""
+        """
+        Fetch *url* and try multiple strategies to find the price.
+
+        Returns ``(price, currency, stale)``; see ``_fetch`` for *stale*.
+        """
         try:
-            resp = requests.get(url, headers=self.DEFAULT_HEADERS, timeout=10)
-            resp.raise_for_status()
+            content, stale = self._fetch(url)
         except requests.RequestException as exc:
             print(f"  Fetch error: {exc}")
-            return None, None
-
-        soup = BeautifulSoup(resp.content, "lxml")
+            return None, None, False
+        return (*self._parse_page(content), stale)
 
+    def _parse_page(self, content: bytes):
+        """Find the price in an HTML document."""
         # Strategy 1: common CSS selectors
-        for sel in self.PRICE_SELECTORS:
-            for el in soup.select(sel):
-                if el.has_attr("data-price"):
-                    try:
-                        return float(el["data-price"]), "USD"
-                    except ValueError:
-                        pass
-                if el.has_attr("content"):
-                    try:
-                        return float(el["content"]), "USD"
-                    except ValueError:
-                        pass
-                price, cur = self._parse_price(el.get_text())
-                if price:
-                    return price, cur
+        if LexborHTMLParser is not None:
+            tree = LexborHTMLParser(content)
+            price, cur = self._match_selectors(
+                (node.attributes, node.text)
+                for sel in self.PRICE_SELECTORS for node in tree.css(sel)
+            )
+            get_page_text = tree.text
+        else:
+            # Parse only price-looking tags first; most pages hit here
+            soup = BeautifulSoup(content, "lxml", parse_only=_PRICE_STRAINER)
+            price, cur = self._match_selectors(self._soup_candidates(soup))
+            if price is None:
+                soup = BeautifulSoup(content, "lxml")
+                price, cur = self._match_selectors(self._soup_candidates(soup))
+            get_page_text = soup.get_text
+        if price is not None:
+            return price, cur
 
         # Strategy 2: regex scan of full page text
-        patterns = [
-            r"\$\s*[\d,]+\.?\d*",
-            r"[\d,]+\.?\d*\s*(?:USD|EUR|GBP)",
-            r"\u20ac\s*[\d,]+\.?\d*",
-            r"\u00a3\s*[\d,]+\.?\d*",
-        ]
-        page_text = soup.get_text()
-        for pat in patterns:
-            found = re.findall(pat, page_text)
+        page_text = get_page_text()
+        for pat in _PAGE_PRICE_RES:
+            found = pat.findall(page_text)
             if found:
                 price, cur = self._parse_price(found[0])
                 if price:
@@ -138,6 +431,28 @@ class PriceTracker:
         print("  Could not detect price on page")
         return None, None
 
+    def _soup_candidates(self, soup):
+        """(attributes, get_text) for each price element, in selector priority order."""
+        hits = self._PRICE_SEL.select(soup)
+        if len(hits) > 1:
+            each = self._PRICE_SEL_EACH
+            hits.sort(key=lambda el: next(i for i, sel in enumerate(each) if sel.match(el)))
+        return ((el.attrs, el.get_text) for el in hits)
+
+    def _match_selectors(self, candidates):
+        """Return the first price found among (attributes, get_text) pairs."""
+        for attrs, get_text in candidates:
+            for attr in ("data-price", "content"):
+                if attrs.get(attr) is not None:
+                    try:
+                        return float(attrs[attr]), "USD"
+                    except ValueError:
+                        pass
+            price, cur = self._parse_price(get_text())
+            if price:
+                return price, cur
+        return None, None
+
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
@@ -148,7 +463,6 @@ class PriceTracker:
             "name": name,
             "url": url,
             "target_price": target_price,
-            "price_history": [],
             "created": datetime.now().isoformat(),
         }
         self._save()
@@ -160,6 +474,10 @@ class PriceTracker:
             name = self.data["products"][product_id]["name"]
             del self.data["products"][product_id]
             self._save()
+            try:
+                self._history_file(product_id).unlink()
+            except FileNotFoundError:
+                pass
             print(f"Removed: {name}")
         else:
             print(f"Not found: {product_id}")
@@ -171,21 +489,28 @@ class PriceTracker:
             return
 
         print(f"Checking: {prod['name']}")
-        price, currency = self._extract_price(prod["url"])
-        if price is None:
+        price, currency, stale = self._extract_price(prod["url"])
+        if price is not None:
+            self._record_price(product_id, price, currency, stale)
+
+    def _record_price(self, product_id: str, price: float, currency: str, stale: bool = False):
+        """Append a reading to the product's history and report the change."""
+        if stale:
+            # An old page isn't a new reading; the refresh lands next check
+            print(f"  Price: {currency} {price:.2f} (cached page, refreshing; not recorded)")
             return
-
+        prod = self.data["products"][product_id]
         record = {"price": price, "currency": currency, "timestamp": datetime.now().isoformat()}
 
-        prev = prod["price_history"][-1]["price"] if prod["price_history"] else None
+        last = self._last_record(product_id)
+        prev = last["price"] if last else None
         if prev is not None:
             change = price - prev
             pct = (change / prev) * 100
             record["change"] = change
             record["change_percent"] = pct
 
-        prod["price_history"].append(record)
-        self._save()
+        self._append_history(product_id, record)
 
         print(f"  Price: {currency} {price:.2f}")
         if prev is not None:
@@ -203,16 +528,30 @@ class PriceTracker:
     def check_all(self):
         print("Checking all products...")
         print("=" * 50)
-        for pid in self.data["products"]:
-            self.check_price(pid)
-            print()
-            time.sleep(2)
+        products = self.data["products"]
+        if not products:
+            return
+        # Fetch concurrently; parse and update history here on the main thread
+        with ThreadPoolExecutor(max_workers=min(self.MAX_WORKERS, len(products))) as pool:
+            futures = {pool.submit(self._fetch, prod["url"]): pid for pid, prod in products.items()}
+            for future in as_completed(futures):
+                pid = futures[future]
+                print(f"Checking: {products[pid]['name']}")
+                try:
+                    content, stale = future.result()
+                except requests.RequestException as exc:
+                    print(f"  Fetch error: {exc}")
+                else:
+                    price, currency = self._parse_page(content)
+                    if price is not None:
+                        self._record_price(pid, price, currency, stale)
+                print()
 
     def list_products(self):
         print("Tracked products:")
         print("-" * 50)
         for pid, prod in self.data["products"].items():
-            latest = prod["price_history"][-1] if prod["price_history"] else None
+            latest = self._last_record(pid)
             price_str = f"{latest['currency']} {latest['price']:.2f}" if latest else "N/A"
             target_str = f" (target: {prod['target_price']})" if prod["target_price"] else ""
             print(f"  [{pid}] {prod['name']} - {price_str}{target_str}")
@@ -224,15 +563,19 @@ class PriceTracker:
             return
 
         filename = filename or f"{product_id}_history.csv"
-        with open(filename, "w") as fh:
-            fh.write("timestamp,price,currency,change,change_percent\n")
-            for r in prod["price_history"]:
-                fh.write(
-                    f"{r['timestamp']},{r['price']},{r['currency']},"
-                    f"{r.get('change', '')},{r.get('change_percent', '')}\n"
-                )
+        with open(filename, "w", newline="") as fh:
+            writer = csv.writer(fh, lineterminator="\n")
+            writer.writerow(("timestamp", "price", "currency", "change", "change_percent"))
+            writer.writerows(
+                (r["timestamp"], r["price"], r["currency"], r.get("change", ""), r.get("change_percent", ""))
+                for r in self._iter_history(product_id)
+            )
         print(f"Exported to: {filename}")
 
+    def history(self, product_id: str, limit: int = None) -> list:
+        """Return *product_id*'s price records, only the newest *limit* if given."""
+        return list(deque(self._iter_history(product_id), maxlen=limit))
+
 
 # ---------------------------------------------------------------------------
 # Interactive CLI
@@ -270,8 +613,7 @@ def main():
             elif cmd == "list":
                 tracker.list_products()
             elif cmd == "history" and len(parts) >= 2:
-                hist = tracker.data["products"].get(parts[1], {}).get("price_history", [])
-                for r in hist[-10:]:
+                for r in tracker.history(parts[1], limit=10):
                     print(f"  {r['timestamp']}: {r['currency']} {r['price']:.2f}")
             elif cmd == "export" and len(parts) >= 2:
                 tracker.export_csv(parts[1])
@@ -5,6 +5,12 @@ Spreadsheet Manager
 Create, read, and modify Excel workbooks with styled headers,
 charts, conditional formatting, and auto-fitted columns.
 
+For large exports, ``SpreadsheetManager(path, write_only=True)`` streams
+rows to disk through openpyxl's write-only mode instead of keeping every
+cell in memory (sheets can then only be appended to).  For plain
+"header + rows" dumps, ``export_bulk(path, headers, rows)`` skips openpyxl
+altogether and writes the XLSX parts straight into the zip archive.
+
 Requires: openpyxl
 
 Usage:
@@ -14,58 +20,254 @@ Usage:
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import math
+import numbers
 import os
 import sys
-from datetime import datetime, timedelta
+import zipfile
+from datetime import date, datetime, time, timedelta
+from xml.sax.saxutils import escape
 
 from openpyxl import Workbook, load_workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
 from openpyxl.styles import Font, Alignment, Border, Side, PatternFill
 from openpyxl.chart import BarChart, LineChart, PieChart, Reference
 from openpyxl.utils import get_column_letter
+from openpyxl.utils.datetime import to_excel
+
+
+# Header styles, built once and shared by every manager
+_THIN_SIDE = Side(style="thin")
+_HEADER_FONT = Font(bold=True, color="FFFFFF", size=11)
+_HEADER_FILL = PatternFill(start_color="2F5496", end_color="2F5496", fill_type="solid")
+_HEADER_ALIGN = Alignment(horizontal="center", vertical="center")
+_THIN_BORDER = Border(left=_THIN_SIDE, right=_THIN_SIDE, top=_THIN_SIDE, bottom=_THIN_SIDE)
+
+# Solid fills by colour, shared across calls and managers
+_FILL_CACHE = {}
+
+# Longest value auto_fit_columns measures: +4 padding hits Excel's 255 limit
+_MAX_FIT_LEN = 251
+
+# Chart classes by kind, for SpreadsheetManager._add_chart
+_CHARTS = {"bar": BarChart, "line": LineChart, "pie": PieChart}
+
+
+def _solid_fill(color: str) -> PatternFill:
+    fill = _FILL_CACHE.get(color)
+    if fill is None:
+        fill = _FILL_CACHE[color] = PatternFill(start_color=color, end_color=color, fill_type="solid")
+    return fill
+
+
+# ---------------------------------------------------------------------------
+# Raw XLSX parts for export_bulk (one sheet; styles: 1 = bold header,
+# 2 = date, 3 = date + time, 4 = time, using Excel's built-in formats)
+# ---------------------------------------------------------------------------
+
+_XML_HEAD = '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+_NS_MAIN = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_NS_REL = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_NS_PKG = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+_BULK_PARTS = {
+    "[Content_Types].xml": (
+        _XML_HEAD
+        + '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '<Override PartName="/xl/styles.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.styles+xml"/>'
+        "</Types>"
+    ),
+    "_rels/.rels": (
+        _XML_HEAD
+        + f'<Relationships xmlns="{_NS_PKG}">'
+        f'<Relationship Id="rId1" Type="{_NS_REL}/officeDocument" Target="xl/workbook.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        _XML_HEAD
+        + f'<Relationships xmlns="{_NS_PKG}">'
+        f'<Relationship Id="rId1" Type="{_NS_REL}/worksheet" Target="worksheets/sheet1.xml"/>'
+        f'<Relationship Id="rId2" Type="{_NS_REL}/styles" Target="styles.xml"/>'
+        "</Relationships>"
+    ),
+    "xl/styles.xml": (
+        _XML_HEAD
+        + f'<styleSheet xmlns="{_NS_MAIN}">'
+        '<fonts count="2"><font><sz val="11"/><name val="Calibri"/></font>'
+        '<font><b/><sz val="11"/><name val="Calibri"/></font></fonts>'
+        '<fills count="2"><fill><patternFill patternType="none"/></fill>'
+        '<fill><patternFill patternType="gray125"/></fill></fills>'
+        '<borders count="1"><border><left/><right/><top/><bottom/><diagonal/></border></borders>'
+        '<cellStyleXfs count="1"><xf numFmtId="0" fontId="0" fillId="0" borderId="0"/></cellStyleXfs>'
+        '<cellXfs count="5"><xf numFmtId="0" fontId="0" fillId="0" borderId="0" xfId="0"/>'
+        '<xf numFmtId="0" fontId="1" fillId="0" borderId="0" xfId="0" applyFont="1"/>'
+        '<xf numFmtId="14" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="22" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/>'
+        '<xf numFmtId="21" fontId="0" fillId="0" borderId="0" xfId="0" applyNumberFormat="1"/></cellXfs>'
+        '<cellStyles count="1"><cellStyle name="Normal" xfId="0" builtinId="0"/></cellStyles>'
+        "</styleSheet>"
+    ),
+}
+
+_WORKBOOK_XML = (
+    _XML_HEAD
+    + f'<workbook xmlns="{_NS_MAIN}" xmlns:r="{_NS_REL}">'
+    '<sheets><sheet name="{name}" sheetId="1" r:id="rId1"/></sheets>'
+    "</workbook>"
+)
+
+
+def _bulk_number(value):
+    """Text for a numeric <v>, or None for NaN/inf (Excel has no such value)."""
+    if not math.isfinite(value):
+        return None
+    if isinstance(value, numbers.Integral):
+        return str(int(value))
+    if isinstance(value, numbers.Real):  # float, numpy floats, Fraction
+        return repr(float(value))
+    return str(value)  # Decimal keeps its exact digits
+
+
+def _bulk_row(r: int, values, letters: list, style: str = "") -> str:
+    """
+    One <row> element, typed like openpyxl would write the same values.
+
+    Strings are inline (XML-illegal control characters stripped), numbers and
+    dates are numeric cells, and None or non-finite floats leave the cell
+    empty.  *style* (the header's bold style) overrides the date styles.
+    """
+    while len(letters) < len(values):
+        letters.append(get_column_letter(len(letters) + 1))
+    cells = []
+    for letter, value in zip(letters, values):
+        if value is None:
+            continue
+        ref = f"{letter}{r}"
+        if value is True or value is False:
+            cells.append(f'<c r="{ref}"{style} t="b"><v>{int(value)}</v></c>')
+        elif isinstance(value, numbers.Number) and not isinstance(value, complex):
+            text = _bulk_number(value)
+            if text is not None:
+                cells.append(f'<c r="{ref}"{style}><v>{text}</v></c>')
+        elif isinstance(value, (date, time)):
+            if getattr(value, "tzinfo", None) is not None:
+                raise TypeError("Excel does not support timezones in datetimes; set tzinfo to None")
+            # datetime subclasses date, so test it first
+            if isinstance(value, datetime):
+                kind = ' s="3"'
+            elif isinstance(value, date):
+                kind = ' s="2"'
+            else:
+                kind = ' s="4"'
+            cells.append(f'<c r="{ref}"{style or kind}><v>{to_excel(value)!r}</v></c>')
+        else:
+            text = escape(ILLEGAL_CHARACTERS_RE.sub("", str(value)))
+            cells.append(f'<c r="{ref}"{style} t="inlineStr"><is><t xml:space="preserve">{text}</t></is></c>')
+    return f'<row r="{r}">{"".join(cells)}</row>'
 
 
 class SpreadsheetManager:
     """High-level Excel automation: create sheets, style, chart, export."""
 
-    def __init__(self, file_path: str = None):
-        if file_path and os.path.exists(file_path):
+    def __init__(self, file_path: str = None, write_only: bool = False):
+        self.write_only = write_only
+        if write_only:
+            # Always a fresh workbook with no default sheet; rows are streamed
+            self.workbook = Workbook(write_only=True)
+            self.file_path = file_path or "output.xlsx"
+            self.sheet = None
+        elif file_path and os.path.exists(file_path):
             self.workbook = load_workbook(file_path)
             self.file_path = file_path
+            self.sheet = self.workbook.active
         else:
             self.workbook = Workbook()
             self.file_path = file_path or "output.xlsx"
-        self.sheet = self.workbook.active
+            self.sheet = self.workbook.active
 
         # Reusable styles
-        self._header_font = Font(bold=True, color="FFFFFF", size=11)
-        self._header_fill = PatternFill(start_color="2F5496", end_color="2F5496", fill_type="solid")
-        self._header_align = Alignment(horizontal="center", vertical="center")
-        self._thin_border = Border(
-            left=Side(style="thin"), right=Side(style="thin"),
-            top=Side(style="thin"), bottom=Side(style="thin"),
-        )
+        self._header_font = _HEADER_FONT
+        self._header_fill = _HEADER_FILL
+        self._header_align = _HEADER_ALIGN
+        self._thin_border = _THIN_BORDER
 
     # ------------------------------------------------------------------
     # Sheet management
     # ------------------------------------------------------------------
 
-    def create_sheet(self, name: str, data=None, headers=None):
+    def create_sheet(self, name: str, data=None, headers=None, column_formats=None, highlights=None):
+        """
+        Create (or reuse) sheet *name* and append *headers* and *data*.
+
+        ``column_formats`` maps 1-based column -> number format and
+        ``highlights`` is a list of ``(col, threshold, color)``; both are
+        applied as each row is appended instead of in a later column pass.
+        """
         if name in self.workbook.sheetnames:
             sheet = self.workbook[name]
         else:
             sheet = self.workbook.create_sheet(title=name)
 
+        if self.write_only:
+            if headers:
+                sheet.append([self._header_cell(sheet, h) for h in headers])
+            if data:
+                self._append_rows(sheet, data, column_formats, highlights)
+            self.sheet = sheet
+            return sheet
+
         if headers:
             sheet.append(headers)
             self._style_header_row(sheet, 1, len(headers))
 
         if data:
-            for row in data:
-                sheet.append(row)
+            self._append_rows(sheet, data, column_formats, highlights)
 
         self.sheet = sheet
         return sheet
 
+    def _append_rows(self, sheet, data, column_formats=None, highlights=None):
+        if not column_formats and not highlights:
+            for row in data:
+                sheet.append(row)
+            return
+
+        # Styled columns become pre-built cells; append() adopts them as-is
+        formats = list((column_formats or {}).items())
+        marks = [(col, threshold, _solid_fill(color)) for col, threshold, color in highlights or ()]
+        for row in data:
+            row = list(row)
+            for col, fmt in formats:
+                if col <= len(row):
+                    cell = row[col - 1] = WriteOnlyCell(sheet, value=row[col - 1])
+                    cell.number_format = fmt
+            for col, threshold, fill in marks:
+                if col > len(row):
+                    continue
+                cell = row[col - 1]
+                if not isinstance(cell, Cell):
+                    cell = row[col - 1] = WriteOnlyCell(sheet, value=cell)
+                if cell.value is not None and cell.value >= threshold:
+                    cell.fill = fill
+            sheet.append(row)
+
+    def _header_cell(self, sheet, value):
+        cell = WriteOnlyCell(sheet, value=value)
+        cell.font = self._header_font
+        cell.fill = self._header_fill
+        cell.alignment = self._header_align
+        cell.border = self._thin_border
+        return cell
+
+    def _require_editable(self):
+        if self.write_only:
+            raise RuntimeError("Not available in write-only mode; use create_sheet/add_row")
+
     def select_sheet(self, name: str):
         if name in self.workbook.sheetnames:
             self.sheet = self.workbook[name]
@@ -77,6 +279,7 @@ class SpreadsheetManager:
     # ------------------------------------------------------------------
 
     def write_headers(self, headers: list, row: int = 1):
+        self._require_editable()
         for col, header in enumerate(headers, 1):
             cell = self.sheet.cell(row=row, column=col, value=header)
             cell.font = self._header_font
@@ -85,6 +288,7 @@ class SpreadsheetManager:
             cell.border = self._thin_border
 
     def write_data(self, data: list, start_row: int = 2):
+        self._require_editable()
         for r, row_data in enumerate(data, start_row):
             for c, value in enumerate(row_data, 1):
                 cell = self.sheet.cell(row=r, column=c, value=value)
@@ -98,76 +302,126 @@ class SpreadsheetManager:
     # ------------------------------------------------------------------
 
     def auto_fit_columns(self, sheet=None):
+        self._require_editable()
         sheet = sheet or self.sheet
-        for col_cells in sheet.columns:
-            max_len = 0
-            col_letter = get_column_letter(col_cells[0].column)
-            for cell in col_cells:
-                try:
-                    length = len(str(cell.value or ""))
-                    if length > max_len:
-                        max_len = length
-                except Exception:
-                    pass
-            sheet.column_dimensions[col_letter].width = max_len + 4
-
-    def format_column_as_currency(self, col: int, start_row: int = 2):
-        for row in range(start_row, self.sheet.max_row + 1):
-            self.sheet.cell(row=row, column=col).number_format = "$#,##0.00"
-
-    def format_column_as_percent(self, col: int, start_row: int = 2):
-        for row in range(start_row, self.sheet.max_row + 1):
-            self.sheet.cell(row=row, column=col).number_format = "0.00%"
+        # One sweep over plain values; no Cell objects are built.  Merged
+        # followers read as None already; the anchor of a range spanning
+        # several columns is skipped explicitly so it cannot widen column one.
+        spans = {
+            (rng.min_row, rng.min_col - 1)
+            for rng in sheet.merged_cells.ranges
+            if rng.max_col > rng.min_col
+        }
+        widths = [0] * sheet.max_column
+        # Excel caps widths at 255, so a column is settled once it reaches
+        # _MAX_FIT_LEN; settled columns are skipped and the sweep stops when
+        # every column is settled.
+        done = bytearray(len(widths))
+        remaining = len(widths)
+        for r, row in enumerate(sheet.iter_rows(values_only=True), 1):
+            for i, value in enumerate(row):
+                if value is not None and not done[i] and not (spans and (r, i) in spans):
+                    length = len(value) if isinstance(value, str) else len(str(value))
+                    if length > widths[i]:
+                        widths[i] = length
+                        if length >= _MAX_FIT_LEN:
+                            done[i] = 1
+                            remaining -= 1
+            if not remaining:
+                break
+        for i, width in enumerate(widths, 1):
+            if width:
+                sheet.column_dimensions[get_column_letter(i)].width = min(width, _MAX_FIT_LEN) + 4
+
+    def format_column(self, col: int, fmt: str, start_row: int = 2):
+        """Apply number format *fmt* to column *col* from *start_row* down."""
+        self._require_editable()
+        # Format strings need no cache: openpyxl interns them per workbook
+        for cell in self._column_cells(col, start_row):
+            cell.number_format = fmt
+
+    def format_column_as_currency(self, col: int, start_row: int = 2, fmt: str = "$#,##0.00"):
+        self.format_column(col, fmt, start_row)
+
+    def format_column_as_percent(self, col: int, start_row: int = 2, fmt: str = "0.00%"):
+        self.format_column(col, fmt, start_row)
 
     def highlight_cells(self, col: int, threshold, color: str = "FFFF00", start_row: int = 2):
-        fill = PatternFill(start_color=color, end_color=color, fill_type="solid")
-        for row in range(start_row, self.sheet.max_row + 1):
-            cell = self.sheet.cell(row=row, column=col)
+        self._require_editable()
+        fill = _solid_fill(color)
+        for cell in self._column_cells(col, start_row):
             if cell.value is not None and cell.value >= threshold:
                 cell.fill = fill
 
+    def _column_cells(self, col: int, start_row: int):
+        """Cells of column *col* from *start_row* down, in one iter_cols sweep."""
+        max_row = self.sheet.max_row
+        if start_row > max_row:
+            return ()
+        (cells,) = self.sheet.iter_cols(min_col=col, max_col=col, min_row=start_row, max_row=max_row)
+        return cells
+
     # ------------------------------------------------------------------
     # Charts
     # ------------------------------------------------------------------
 
     def add_bar_chart(self, title, data_col, cat_col=1, start_row=1, end_row=None, position="E2"):
-        end_row = end_row or self.sheet.max_row
-        chart = BarChart()
-        chart.title = title
-        chart.style = 10
-        data = Reference(self.sheet, min_col=data_col, min_row=start_row, max_row=end_row)
-        cats = Reference(self.sheet, min_col=cat_col, min_row=start_row + 1, max_row=end_row)
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(cats)
-        chart.width = 18
-        chart.height = 12
-        self.sheet.add_chart(chart, position)
+        self._add_chart("bar", title, data_col, cat_col, start_row, end_row, position)
 
     def add_line_chart(self, title, data_col, cat_col=1, start_row=1, end_row=None, position="E2"):
-        end_row = end_row or self.sheet.max_row
-        chart = LineChart()
-        chart.title = title
-        chart.style = 10
-        data = Reference(self.sheet, min_col=data_col, min_row=start_row, max_row=end_row)
-        cats = Reference(self.sheet, min_col=cat_col, min_row=start_row + 1, max_row=end_row)
-        chart.add_data(data, titles_from_data=True)
-        chart.set_categories(cats)
-        chart.width = 18
-        chart.height = 12
-        self.sheet.add_chart(chart, position)
+        self._add_chart("line", title, data_col, cat_col, start_row, end_row, position)
 
     def add_pie_chart(self, title, data_col, cat_col=1, start_row=1, end_row=None, position="E2"):
+        self._add_chart("pie", title, data_col, cat_col, start_row, end_row, position, width=16)
+
+    def _add_chart(self, kind, title, data_col, cat_col=1, start_row=1, end_row=None,
+                   position="E2", width=18, height=12):
+        self._require_editable()
         end_row = end_row or self.sheet.max_row
-        chart = PieChart()
+        chart = _CHARTS[kind]()
         chart.title = title
+        if kind != "pie":
+            chart.style = 10
         data = Reference(self.sheet, min_col=data_col, min_row=start_row, max_row=end_row)
         cats = Reference(self.sheet, min_col=cat_col, min_row=start_row + 1, max_row=end_row)
         chart.add_data(data, titles_from_data=True)
         chart.set_categories(cats)
-        chart.width = 16
-        chart.height = 12
+        chart.width = width
+        chart.height = height
         self.sheet.add_chart(chart, position)
 
+    # ------------------------------------------------------------------
+    # Bulk export
+    # ------------------------------------------------------------------
+
+    def export_bulk(self, path: str, headers, rows, sheet_name: str = "Sheet1"):
+        """
+        Write *headers* (bold) and *rows* to a new single-sheet XLSX at *path*.
+
+        Rows are consumed one at a time from any iterable and written straight
+        to the archive, so no cell objects or full row list are ever held.
+        Returns the number of data rows written.
+        """
+        letters = []
+        count = 0
+        with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name, xml in _BULK_PARTS.items():
+                zf.writestr(name, xml)
+            zf.writestr("xl/workbook.xml", _WORKBOOK_XML.replace("{name}", escape(sheet_name, {'"': "&quot;"})))
+            with zf.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as fh:
+                fh.write(f'{_XML_HEAD}<worksheet xmlns="{_NS_MAIN}"><sheetData>'.encode("utf-8"))
+                r = 1
+                if headers:
+                    fh.write(_bulk_row(1, headers, letters, ' s="1"').encode("utf-8"))
+                    r = 2
+                for row in rows:
+                    fh.write(_bulk_row(r, row, letters).encode("utf-8"))
+                    r += 1
+                    count += 1
+                fh.write(b"</sheetData></worksheet>")
+        print(f"Saved: {path} ({count} rows)")
+        return count
+
     # ------------------------------------------------------------------
     # Save / utility
     # ------------------------------------------------------------------
@@ -205,12 +459,12 @@ def demo():
         ["June", 18200, 10200, 8000, 0.10],
     ]
 
-    mgr.create_sheet("Sales Report", data=data, headers=headers)
-    mgr.format_column_as_currency(2)
-    mgr.format_column_as_currency(3)
-    mgr.format_column_as_currency(4)
-    mgr.format_column_as_percent(5)
-    mgr.highlight_cells(col=4, threshold=6000, color="92D050")
+    currency = "$#,##0.00"
+    mgr.create_sheet(
+        "Sales Report", data=data, headers=headers,
+        column_formats={2: currency, 3: currency, 4: currency, 5: "0.00%"},
+        highlights=[(4, 6000, "92D050")],
+    )
     mgr.auto_fit_columns()
     mgr.add_bar_chart("Monthly Revenue", data_col=2, position="G2")
     mgr.add_line_chart("Profit Trend", data_col=4, position="G18")
@@ -5,7 +5,8 @@ Task Scheduler
 Schedule and run recurring Python tasks with error handling,
 retry logic, and persistent configuration.
 
-Requires: schedule
+No third-party dependencies: due tasks are kept in a heap ordered by
+next run time and the run loop sleeps until the earliest one is due.
 
 Usage:
     python task_scheduler.py             # Run demo scheduler
@@ -14,19 +15,63 @@ Usage:
 Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-tasks
 """
 
+import re
 import sys
 import json
 import time
+import heapq
 import logging
+import itertools
 import threading
 from pathlib import Path
-from datetime import datetime
-
-import schedule
+from datetime import datetime, timedelta
 
 
 logger = logging.getLogger("task_scheduler")
 
+# One pass over an interval string picks out its time, count and unit
+_INTERVAL_TOKEN_RE = re.compile(
+    r"(?P<at>\d{1,2}:\d{2})|(?P<num>\d+)|(?P<unit>second|minute|hour|daily|day)"
+)
+
+# unit -> (kind, default count, seconds per count), in precedence order
+_UNITS = {
+    "second": ("seconds", 10, 1),
+    "minute": ("minutes", 1, 60),
+    "hour": ("hours", 1, 3600),
+    "day": ("daily", 1, 86400),
+}
+_KIND_SECONDS = {kind: seconds for kind, _, seconds in _UNITS.values()}
+
+
+def _parse_interval(interval: str) -> tuple:
+    """
+    Parse a human-readable interval into ``(kind, n, at)``.
+
+    "every 30 seconds" -> ("seconds", 30, None)
+    "daily at 09:00"   -> ("daily", 1, (9, 0))
+    Anything unrecognised runs every 60 seconds; a count of 0 raises
+    ValueError rather than scheduling a task that never sleeps.
+    """
+    at = num = None
+    units = set()
+    for m in _INTERVAL_TOKEN_RE.finditer(interval.lower()):
+        if m.group("at") and at is None:
+            hour, minute = m.group("at").split(":")
+            at = (int(hour), int(minute))
+        elif m.group("num") and num is None:
+            num = int(m.group("num"))
+        elif m.group("unit"):
+            units.add("day" if m.group("unit") == "daily" else m.group("unit"))
+    for unit, (kind, default, _) in _UNITS.items():
+        if unit in units:
+            if kind == "daily":
+                return kind, 1, at
+            if num == 0:
+                raise ValueError(f"Interval must be at least 1 {unit}: {interval!r}")
+            return kind, num if num is not None else default, None
+    return "seconds", 60, None
+
 
 class TaskScheduler:
     """
@@ -44,6 +89,10 @@ class TaskScheduler:
         self.tasks = {}
         self.stats = {}
         self._stop_event = threading.Event()
+        self._wakeup = threading.Event()   # set when the heap changes
+        self._lock = threading.Lock()
+        self._heap = []                    # (next_run_ts, seq, name)
+        self._seq = itertools.count()      # tells re-added tasks from stale entries
 
     # ------------------------------------------------------------------
     # Task management
@@ -79,6 +128,7 @@ class TaskScheduler:
             "interval": interval,
             "max_retries": max_retries,
             "retry_delay": retry_delay,
+            "parsed": _parse_interval(interval),
         }
         self.stats[name] = {"runs": 0, "successes": 0, "failures": 0, "last_run": None}
         self._schedule_task(name)
@@ -86,8 +136,9 @@ class TaskScheduler:
 
     def remove_task(self, name: str):
         if name in self.tasks:
+            # Its heap entry is dropped lazily when it comes due
             del self.tasks[name]
-            schedule.clear(name)
+            self._wakeup.set()
             logger.info("Removed task: %s", name)
 
     # ------------------------------------------------------------------
@@ -96,29 +147,27 @@ class TaskScheduler:
 
     def _schedule_task(self, name: str):
         info = self.tasks[name]
-        interval = info["interval"].lower()
-
-        job = None
-        if "second" in interval:
-            n = self._extract_number(interval, 10)
-            job = schedule.every(n).seconds
-        elif "minute" in interval:
-            n = self._extract_number(interval, 1)
-            job = schedule.every(n).minutes
-        elif "hour" in interval:
-            n = self._extract_number(interval, 1)
-            job = schedule.every(n).hours
-        elif "daily" in interval or "day" in interval:
-            import re
-            m = re.search(r"(\d{1,2}:\d{2})", interval)
-            if m:
-                job = schedule.every().day.at(m.group(1))
-            else:
-                job = schedule.every().day
-        else:
-            job = schedule.every(60).seconds
-
-        job.do(self._run_task, name).tag(name)
+        kind, n, info["at"] = info["parsed"]
+        info["period"] = n * _KIND_SECONDS[kind]
+        info["seq"] = next(self._seq)
+        self._push(name, info)
+
+    def _push(self, name: str, info: dict):
+        """Queue *name* for its next run after now."""
+        with self._lock:
+            heapq.heappush(self._heap, (self._next_run(info), info["seq"], name))
+        self._wakeup.set()
+
+    @staticmethod
+    def _next_run(info: dict) -> float:
+        if info["at"] is None:
+            return time.time() + info["period"]
+        hour, minute = info["at"]
+        now = datetime.now()
+        due = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if due <= now:
+            due += timedelta(days=1)
+        return due.timestamp()
 
     def _run_task(self, name: str):
         info = self.tasks.get(name)
@@ -142,12 +191,6 @@ class TaskScheduler:
         self.stats[name]["failures"] += 1
         logger.error("[%s] All %d attempts failed", name, info["max_retries"])
 
-    @staticmethod
-    def _extract_number(text: str, default: int) -> int:
-        import re
-        m = re.search(r"(\d+)", text)
-        return int(m.group(1)) if m else default
-
     # ------------------------------------------------------------------
     # Run loop
     # ------------------------------------------------------------------
@@ -155,15 +198,34 @@ class TaskScheduler:
     def run(self):
         """Block and run all scheduled tasks until Ctrl+C."""
         print(f"Scheduler running with {len(self.tasks)} task(s). Ctrl+C to stop.")
+        # Windows can't interrupt an untimed wait with Ctrl+C
+        max_wait = 1.0 if sys.platform == "win32" else None
         try:
             while not self._stop_event.is_set():
-                schedule.run_pending()
-                time.sleep(1)
+                with self._lock:
+                    due = self._heap[0][0] if self._heap else None
+                wait = None if due is None else due - time.time()
+                if wait is None or wait > 0:
+                    if max_wait is not None:
+                        wait = max_wait if wait is None else min(wait, max_wait)
+                    self._wakeup.wait(wait)
+                    self._wakeup.clear()
+                    continue
+
+                with self._lock:
+                    _, seq, name = heapq.heappop(self._heap)
+                info = self.tasks.get(name)
+                if info is None or info["seq"] != seq:
+                    continue    # removed or re-added since it was queued
+                self._run_task(name)
+                if self.tasks.get(name) is info:
+                    self._push(name, info)
         except KeyboardInterrupt:
             print("\nScheduler stopped.")
 
     def stop(self):
         self._stop_event.set()
+        self._wakeup.set()
 
     def print_stats(self):
         print("Task Statistics:")
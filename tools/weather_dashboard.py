@@ -13,9 +13,30 @@ Learn more: https://raccoonette.gumroad.com/l/Python-for-automating-every-day-ta
 """
 
 import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache
 
-import requests
+
+# Coarse condition bucket per WMO code for classify_bulk (255 = unknown).
+# Must cover exactly WeatherDashboard.WEATHER_CODES; checked below the class.
+_CODE_BUCKETS = {
+    0: 0, 1: 0,                                              # clear
+    2: 1, 3: 1, 45: 1, 48: 1,                                # cloud / fog
+    51: 2, 53: 2, 55: 2, 61: 2, 63: 2, 65: 2, 80: 2, 81: 2, 82: 2,  # rain
+    71: 3, 73: 3, 75: 3, 85: 3, 86: 3,                       # snow
+    95: 4, 96: 4, 99: 4,                                     # storm
+}
+_BUCKET_TABLE = bytes(_CODE_BUCKETS.get(code, 255) for code in range(256))
+
+
+def _write_lines(lines):
+    """Emit a whole table with one write instead of a print() per row."""
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 class WeatherDashboard:
@@ -34,12 +55,50 @@ class WeatherDashboard:
         85: "Snow showers", 86: "Heavy snow showers",
         95: "Thunderstorm", 96: "Thunderstorm + hail", 99: "Thunderstorm + heavy hail",
     }
+    # WMO codes are 0-99: index straight into a table (None = unknown code)
+    _DESC_TABLE = tuple(map(WEATHER_CODES.get, range(100)))
+
+    # Buckets returned by classify_bulk, by index
+    CONDITION_BUCKETS = ("clear", "cloud", "rain", "snow", "storm")
+    UNKNOWN_BUCKET = 255
 
     COMPASS = [
         "N", "NNE", "NE", "ENE", "E", "ESE", "SE", "SSE",
         "S", "SSW", "SW", "WSW", "W", "WNW", "NW", "NNW",
     ]
 
+    # For labelling the API's fixed ISO dates without strptime/strftime
+    _WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+    _MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+               "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+    # Fields requested for each forecast block
+    CURRENT_FIELDS = [
+        "temperature_2m", "relative_humidity_2m", "apparent_temperature",
+        "precipitation", "weather_code", "wind_speed_10m", "wind_direction_10m",
+    ]
+    HOURLY_FIELDS = ["temperature_2m", "precipitation_probability", "weather_code"]
+    DAILY_FIELDS = [
+        "weather_code", "temperature_2m_max", "temperature_2m_min",
+        "precipitation_sum", "precipitation_probability_max",
+    ]
+    MAX_FORECAST_DAYS = 16  # Open-Meteo limit
+
+    WEATHER_TTL = 600  # seconds a weather response is reused for the same request
+    WEATHER_CACHE_SIZE = 128  # responses kept; least recently used go first
+
+    def __init__(self):
+        # Imported here so --help doesn't pay for requests/urllib3/ssl
+        import requests
+
+        self._requests = requests
+        # One pooled session, so repeat requests reuse the TCP/TLS connection
+        self._session = requests.Session()
+        self._weather_cache = OrderedDict()  # (lat, lon, blocks, days) -> (expires_at, data)
+        self._cache_lock = threading.Lock()  # compare() fetches from several threads
+        # City coordinates don't change; failed lookups raise and aren't cached
+        self._geocode = lru_cache(maxsize=128)(self._geocode_uncached)
+
     # ------------------------------------------------------------------
     # Lookups
     # ------------------------------------------------------------------
@@ -47,47 +106,117 @@ class WeatherDashboard:
     def get_coordinates(self, city: str):
         """Return (lat, lon, display_name) or None."""
         try:
-            resp = requests.get(
-                self.GEOCODING_URL,
-                params={"name": city, "count": 1, "language": "en", "format": "json"},
-                timeout=10,
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            if "results" in data and data["results"]:
-                r = data["results"][0]
-                return r["latitude"], r["longitude"], f"{r['name']}, {r.get('country', '')}"
-        except requests.RequestException as exc:
+            return self._geocode(city)
+        except self._requests.RequestException as exc:
             print(f"Geocoding error: {exc}")
         return None
 
+    def _geocode_uncached(self, city: str):
+        resp = self._session.get(
+            self.GEOCODING_URL,
+            params={"name": city, "count": 1, "language": "en", "format": "json"},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        data = resp.json()
+        if "results" in data and data["results"]:
+            r = data["results"][0]
+            return r["latitude"], r["longitude"], f"{r['name']}, {r.get('country', '')}"
+        return None
+
     def get_weather(self, lat: float, lon: float) -> dict:
-        params = {
-            "latitude": lat, "longitude": lon,
-            "current": [
-                "temperature_2m", "relative_humidity_2m", "apparent_temperature",
-                "precipitation", "weather_code", "wind_speed_10m", "wind_direction_10m",
-            ],
-            "hourly": ["temperature_2m", "precipitation_probability", "weather_code"],
-            "daily": [
-                "weather_code", "temperature_2m_max", "temperature_2m_min",
-                "precipitation_sum", "precipitation_probability_max",
-            ],
-            "timezone": "auto", "forecast_days": 7,
-        }
+        """Current conditions plus 7 days of hourly and daily forecast."""
+        return self._fetch_weather(
+            lat, lon, forecast_days=7,
+            current=self.CURRENT_FIELDS, hourly=self.HOURLY_FIELDS, daily=self.DAILY_FIELDS,
+        )
+
+    def get_current(self, lat: float, lon: float) -> dict:
+        """Only the ``current`` block."""
+        return self._fetch_weather(lat, lon, current=self.CURRENT_FIELDS)
+
+    def get_hourly(self, lat: float, lon: float, hours: int = 24) -> dict:
+        """Only the ``hourly`` block, covering at least *hours* from now."""
+        # One spare day in case the location's date is ahead of ours
+        days = (datetime.now().hour + hours) // 24 + 2
+        return self._fetch_weather(
+            lat, lon, forecast_days=min(days, self.MAX_FORECAST_DAYS), hourly=self.HOURLY_FIELDS,
+        )
+
+    def get_daily(self, lat: float, lon: float, days: int = 7) -> dict:
+        """Only the ``daily`` block, for *days* days (fewer days, smaller response)."""
+        days = max(1, min(days, self.MAX_FORECAST_DAYS))
+        return self._fetch_weather(lat, lon, forecast_days=days, daily=self.DAILY_FIELDS)
+
+    def _fetch_weather(self, lat: float, lon: float, forecast_days: int = None, **blocks) -> dict:
+        key = (lat, lon, tuple(sorted(blocks)), forecast_days)
+        cache = self._weather_cache
+        with self._cache_lock:
+            cached = cache.get(key)
+            if cached is not None:
+                if cached[0] > time.monotonic():
+                    cache.move_to_end(key)
+                    return cached[1]
+                del cache[key]
+        params = {"latitude": lat, "longitude": lon, "timezone": "auto", **blocks}
+        if forecast_days is not None:
+            params["forecast_days"] = forecast_days
         try:
-            resp = requests.get(self.WEATHER_URL, params=params, timeout=10)
+            resp = self._session.get(self.WEATHER_URL, params=params, timeout=10)
             resp.raise_for_status()
-            return resp.json()
-        except requests.RequestException as exc:
+            data = resp.json()
+        except self._requests.RequestException as exc:
             print(f"Weather API error: {exc}")
             return None
+        with self._cache_lock:
+            cache[key] = (time.monotonic() + self.WEATHER_TTL, data)
+            cache.move_to_end(key)
+            if len(cache) > self.WEATHER_CACHE_SIZE:
+                cache.popitem(last=False)
+        return data
 
     def _desc(self, code: int) -> str:
-        return self.WEATHER_CODES.get(code, f"Unknown ({code})")
+        idx = code
+        if type(code) is not int:
+            # 3.0 from a JSON payload or an int subclass: index whole numbers only
+            try:
+                idx = int(code) if code == int(code) else None
+            except (TypeError, ValueError, OverflowError):
+                idx = None
+        desc = self._DESC_TABLE[idx] if idx is not None and 0 <= idx < 100 else None
+        return desc or f"Unknown ({code})"
+
+    def classify_bulk(self, codes):
+        """
+        Map many WMO codes to CONDITION_BUCKETS indices (UNKNOWN_BUCKET if unmapped).
+
+        Plain sequences come back as ``bytes`` from a single C-level
+        ``bytes.translate`` over a 256-entry table; numpy arrays come back as
+        a ``uint8`` array via the same table.
+        """
+        if hasattr(codes, "dtype"):
+            import numpy as np
+
+            codes = np.asarray(codes)
+            out = np.full(codes.shape, self.UNKNOWN_BUCKET, dtype=np.uint8)
+            valid = (codes >= 0) & (codes < 256)
+            out[valid] = np.frombuffer(_BUCKET_TABLE, dtype=np.uint8)[codes[valid].astype(np.intp)]
+            return out
+        if not isinstance(codes, (list, tuple)):
+            codes = list(codes)
+        try:
+            return bytes(codes).translate(_BUCKET_TABLE)
+        except (TypeError, ValueError):  # non-int or out-of-range codes
+            get = _CODE_BUCKETS.get
+            return bytes([get(code, self.UNKNOWN_BUCKET) for code in codes])
+
+    def _day_label(self, iso_date: str) -> str:
+        """'2026-02-15' -> 'Sun, Feb 15'."""
+        y, m, d = int(iso_date[0:4]), int(iso_date[5:7]), int(iso_date[8:10])
+        return f"{self._WEEKDAYS[datetime(y, m, d).weekday()]}, {self._MONTHS[m - 1]} {d:02d}"
 
     def _wind_dir(self, deg: float) -> str:
-        return self.COMPASS[round(deg / 22.5) % 16]
+        return self.COMPASS[round(deg / 22.5) & 15]  # len(COMPASS) == 16
 
     # ------------------------------------------------------------------
     # Display methods
@@ -98,7 +227,7 @@ class WeatherDashboard:
         if not coords:
             return
         lat, lon, name = coords
-        w = self.get_weather(lat, lon)
+        w = self.get_current(lat, lon)
         if not w:
             return
         c = w["current"]
@@ -116,55 +245,86 @@ class WeatherDashboard:
         if not coords:
             return
         lat, lon, name = coords
-        w = self.get_weather(lat, lon)
+        w = self.get_daily(lat, lon, days)
         if not w:
             return
         d = w["daily"]
-        print(f"\n{days}-Day Forecast for {name}")
-        print("=" * 60)
-        for i in range(min(days, len(d["time"]))):
-            dt = datetime.strptime(d["time"][i], "%Y-%m-%d").strftime("%a, %b %d")
-            cond = self._desc(d["weather_code"][i])
-            print(f"\n{dt}")
-            print(f"  {cond}")
-            print(f"  High: {d['temperature_2m_max'][i]} C  Low: {d['temperature_2m_min'][i]} C")
-            print(f"  Precipitation chance: {d['precipitation_probability_max'][i]}%")
+        out = [f"\n{days}-Day Forecast for {name}", "=" * 60]
+        # Bind the columns once rather than re-hashing into d every line
+        times, codes = d["time"], d["weather_code"]
+        highs, lows = d["temperature_2m_max"], d["temperature_2m_min"]
+        precs = d["precipitation_probability_max"]
+        day_label, desc = self._day_label, self._desc
+        for i in range(min(days, len(times))):
+            out.append(f"\n{day_label(times[i])}")
+            out.append(f"  {desc(codes[i])}")
+            out.append(f"  High: {highs[i]} C  Low: {lows[i]} C")
+            out.append(f"  Precipitation chance: {precs[i]}%")
+        _write_lines(out)
 
     def hourly(self, city: str, hours: int = 12):
         coords = self.get_coordinates(city)
         if not coords:
             return
         lat, lon, name = coords
-        w = self.get_weather(lat, lon)
+        w = self.get_hourly(lat, lon, hours)
         if not w:
             return
         h = w["hourly"]
+        times, temps = h["time"], h["temperature_2m"]
+        precs, codes = h["precipitation_probability"], h["weather_code"]
         now_str = datetime.now().strftime("%Y-%m-%dT%H:00")
-        start = next((i for i, t in enumerate(h["time"]) if t >= now_str), 0)
-        print(f"\nHourly Forecast for {name} (next {hours} hours)")
-        print("=" * 60)
-        print(f"{'Time':<10} {'Temp':<8} {'Precip%':<9} Conditions")
-        print("-" * 60)
-        for i in range(start, min(start + hours, len(h["time"]))):
-            t = datetime.strptime(h["time"][i], "%Y-%m-%dT%H:%M").strftime("%H:%M")
-            print(f"{t:<10} {h['temperature_2m'][i]:>5.1f} C  {h['precipitation_probability'][i]:>5}%    {self._desc(h['weather_code'][i])}")
+        # Times are sorted ISO strings, so the first hour >= now is a bisect
+        start = bisect_left(times, now_str)
+        if start == len(times):
+            start = 0
+        out = [
+            f"\nHourly Forecast for {name} (next {hours} hours)",
+            "=" * 60,
+            f"{'Time':<10} {'Temp':<8} {'Precip%':<9} Conditions",
+            "-" * 60,
+        ]
+        desc = self._desc
+        for i in range(start, min(start + hours, len(times))):
+            out.append(f"{times[i][11:16]:<10} {temps[i]:>5.1f} C  {precs[i]:>5}%    {desc(codes[i])}")
+        _write_lines(out)
 
     def compare(self, cities: list):
-        print("\nWeather Comparison")
-        print("=" * 70)
-        print(f"{'City':<25} {'Temp':<10} {'Humidity':<10} Conditions")
-        print("-" * 70)
-        for city in cities:
-            coords = self.get_coordinates(city)
-            if not coords:
-                continue
-            lat, lon, name = coords
-            w = self.get_weather(lat, lon)
-            if not w:
+        out = [
+            "\nWeather Comparison",
+            "=" * 70,
+            f"{'City':<25} {'Temp':<10} {'Humidity':<10} Conditions",
+            "-" * 70,
+        ]
+        if not cities:
+            _write_lines(out)
+            return
+        # Cities are fetched concurrently but listed in the order given
+        with ThreadPoolExecutor(max_workers=min(8, len(cities))) as ex:
+            results = list(ex.map(self._fetch_city, cities))
+        for result in results:
+            if result is None:
                 continue
-            c = w["current"]
+            name, c = result
             label = (name[:23] + "..") if len(name) > 25 else name
-            print(f"{label:<25} {c['temperature_2m']:>6.1f} C  {c['relative_humidity_2m']:>6}%    {self._desc(c['weather_code'])}")
+            out.append(f"{label:<25} {c['temperature_2m']:>6.1f} C  {c['relative_humidity_2m']:>6}%    {self._desc(c['weather_code'])}")
+        _write_lines(out)
+
+    def _fetch_city(self, city: str):
+        """Return (display_name, current_conditions) for *city*, or None."""
+        coords = self.get_coordinates(city)
+        if not coords:
+            return None
+        lat, lon, name = coords
+        w = self.get_current(lat, lon)
+        if not w:
+            return None
+        return name, w["current"]
+
+
+assert _CODE_BUCKETS.keys() == WeatherDashboard.WEATHER_CODES.keys(), (
+    "_CODE_BUCKETS is out of sync with WEATHER_CODES"
+)
 
 
 # ---------------------------------------------------------------------------